@@ -0,0 +1,169 @@
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import psutil
+import pytest
+
+from neurons.Validator import miner_script_m_merkletree as miner_script
+from neurons.Validator.pog import get_random_indices, get_random_seeds
+
+MEMORY_BASELINE = os.path.join(os.path.dirname(__file__), "memory_baseline.json")
+# Peaks below this many bytes over baseline are treated as noise
+MEMORY_SLACK = 1 << 20
+PEAK_MEMORY = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("pog-benchmarks")
+    group.addoption("--memory-baseline", default=MEMORY_BASELINE, help="JSON file of peak memory per benchmark.")
+    group.addoption("--memory-tolerance", type=float, default=0.25, help="Allowed relative peak memory growth over the baseline.")
+    group.addoption("--memory-rounds", type=int, default=5, help="Runs whose median traced peak is recorded.")
+    group.addoption("--check-memory", action="store_true", help="Fail, rather than warn, on a peak memory regression.")
+    group.addoption("--update-memory-baseline", action="store_true", help="Rewrite the memory baseline from this run.")
+
+
+def pytest_configure(config):
+    config.stash[PEAK_MEMORY] = {}
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    measured = config.stash.get(PEAK_MEMORY, {})
+    if not measured:
+        return
+    terminalreporter.section("peak memory")
+    width = max(len(name) for name in measured)
+    for name, peak in sorted(measured.items()):
+        terminalreporter.write_line(f"{name:<{width}}  {peak / 2**20:10.2f} MiB")
+
+
+class FakeSSHTransport:
+    """
+    In-memory stand-in for the read_file side of the miner SSH connection.
+
+    receive_responses only reads files, so this does not implement the rest of the
+    Transport interface; files are served from a dict of remote path -> bytes.
+    """
+
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+
+    async def read_file(self, remote_path, max_size=None):
+        data = self.files[remote_path]
+        if max_size is not None and len(data) > max_size:
+            raise ValueError(f"{remote_path} is larger than {max_size} bytes")
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def pog_round(n, num_indices, num_gpus, hash_algorithm="sha256"):
+    """Run the miner side of one PoG round on CPU and return (seeds, root_hashes, responses, indices)."""
+    hash_func = miner_script.get_hash_func(hash_algorithm)
+    seeds = get_random_seeds(num_gpus)
+    indices = get_random_indices(num_gpus, n, num_indices)
+    root_hashes, responses = {}, {}
+    for gpu_id, (s_A, s_B) in seeds.items():
+        C = (miner_script.generate_matrix_torch(s_A, n) @ miner_script.generate_matrix_torch(s_B, n)).numpy()
+        root_hash, tree = miner_script.build_merkle_tree_rows(C, hash_func)
+        root_hashes[gpu_id] = root_hash.hex()
+        responses[gpu_id] = miner_script.pack_responses(
+            indices[gpu_id],
+            [C[i, :] for i, _ in indices[gpu_id]],
+            [miner_script.get_merkle_proof_row(tree, i, n) for i, _ in indices[gpu_id]],
+        )
+    return seeds, root_hashes, responses, indices
+
+
+def measure_peak_memory(func, *args):
+    """
+    Peak memory of one call in bytes, as (traced_peak, rss_growth).
+
+    The tracemalloc peak is exact for NumPy and Python objects. The sampled RSS growth
+    also covers torch's CPU allocator, which tracemalloc cannot see, but depends on
+    what the allocator already holds, so it is only reported.
+    """
+    process = psutil.Process()
+    baseline_rss = process.memory_info().rss
+    peak_rss = baseline_rss
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak_rss
+        while not done.is_set():
+            peak_rss = max(peak_rss, process.memory_info().rss)
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    tracemalloc.start()
+    sampler.start()
+    try:
+        func(*args)
+    finally:
+        done.set()
+        sampler.join()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    peak_rss = max(peak_rss, process.memory_info().rss)
+    return traced_peak, peak_rss - baseline_rss
+
+
+@pytest.fixture(scope="session")
+def memory_baseline(request):
+    path = request.config.getoption("--memory-baseline")
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+    measured = request.config.stash[PEAK_MEMORY]
+    yield baseline, measured
+    if request.config.getoption("--update-memory-baseline"):
+        with open(path, "w") as f:
+            json.dump(dict(sorted({**baseline, **measured}.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def pog_benchmark(benchmark, memory_baseline, request):
+    """
+    Benchmark a callable and record its peak memory next to the timings.
+
+    The median tracemalloc peak over --memory-rounds runs is stored in the benchmark's
+    extra_info and compared with the baseline; exceeding it by more than
+    --memory-tolerance warns, or fails the test with --check-memory.
+    """
+    baseline, measured = memory_baseline
+    tolerance = request.config.getoption("--memory-tolerance")
+    rounds = max(1, request.config.getoption("--memory-rounds"))
+    name = request.node.name
+
+    def run(func, *args):
+        samples = [measure_peak_memory(func, *args) for _ in range(rounds)]
+        peak = int(statistics.median(traced for traced, _ in samples))
+        measured[name] = peak
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        benchmark.extra_info["peak_rss_growth_bytes"] = int(statistics.median(rss for _, rss in samples))
+        result = benchmark(func, *args)
+
+        if name in baseline and not request.config.getoption("--update-memory-baseline"):
+            limit = baseline[name] * (1 + tolerance) + MEMORY_SLACK
+            if peak > limit:
+                message = f"Peak memory regression: {peak} bytes > {int(limit)} bytes allowed (baseline {baseline[name]})."
+                if request.config.getoption("--check-memory"):
+                    pytest.fail(message)
+                warnings.warn(message)
+        return result
+
+    return run
+
+
+@pytest.fixture
+def random_float_rows():
+    def make(num_rows, row_length, seed=0):
+        return np.random.default_rng(seed).random((num_rows, row_length), dtype=np.float32)
+    return make
@@ -0,0 +1,60 @@
+"""
+CPU benchmarks for the Proof-of-GPU miner and verification paths.
+
+Timings are stored with --benchmark-save and compared with --benchmark-compare;
+peak memory is compared with memory_baseline.json on every run (see QA.md).
+"""
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from conftest import FakeSSHTransport, pog_round
+from neurons.Validator import miner_script_m_merkletree as miner_script
+from neurons.Validator.pog import parse_responses, receive_responses, verify_responses
+
+N_GRID = [256, 1024]
+INDEX_GRID = [1, 32]
+GPU_GRID = [1, 4]
+
+
+@pytest.mark.parametrize("n", N_GRID)
+def test_generate_matrix_torch(pog_benchmark, n):
+    pog_benchmark(miner_script.generate_matrix_torch, 12345, n)
+
+
+@pytest.mark.parametrize("hash_algorithm", ["sha256", "blake3"])
+@pytest.mark.parametrize("n", N_GRID)
+def test_build_merkle_tree_rows(pog_benchmark, random_float_rows, n, hash_algorithm):
+    pog_benchmark(miner_script.build_merkle_tree_rows, random_float_rows(n, n), miner_script.get_hash_func(hash_algorithm))
+
+
+@pytest.mark.parametrize("num_leaves", [1024, 65536])
+def test_get_merkle_proof_row(pog_benchmark, num_leaves):
+    leaves = [hashlib.sha256(i.to_bytes(4, "little")).digest() for i in range(num_leaves)]
+    _, tree = miner_script.build_merkle_tree(leaves)
+    pog_benchmark(miner_script.get_merkle_proof_row, tree, num_leaves // 3, num_leaves)
+
+
+@pytest.mark.parametrize("num_gpus", GPU_GRID)
+@pytest.mark.parametrize("num_indices", INDEX_GRID)
+@pytest.mark.parametrize("n", N_GRID)
+def test_verify_responses(pog_benchmark, n, num_indices, num_gpus):
+    seeds, root_hashes, responses, indices = pog_round(n, num_indices, num_gpus)
+    assert pog_benchmark(verify_responses, seeds, root_hashes, responses, indices, n)
+
+
+@pytest.mark.parametrize("num_gpus", GPU_GRID)
+@pytest.mark.parametrize("num_indices", INDEX_GRID)
+def test_receive_and_parse_responses(pog_benchmark, num_indices, num_gpus):
+    n = N_GRID[-1]
+    _, _, responses, _ = pog_round(n, num_indices, num_gpus)
+    transport = FakeSSHTransport({f"/dev/shm/responses_gpu_{gpu_id}.bin": data for gpu_id, data in responses.items()})
+
+    def receive_and_parse():
+        received = asyncio.run(receive_responses(transport, num_gpus))
+        return [parse_responses(data) for data in received.values()]
+
+    parsed = pog_benchmark(receive_and_parse)
+    assert all(np.asarray(p["rows"]).shape == (num_indices, n) for p in parsed)
@@ -1,84 +1,121 @@
 import os
 import sqlite3
+import threading
 
 import bittensor as bt
 from dotenv import load_dotenv
 
+from compute.utils.migrations import migrate
+
 load_dotenv()
 
+# Seconds a connection waits for another writer's lock before raising "database is locked"
+BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 30))
+
+# Applied to every connection. WAL lets readers run alongside the single writer, and
+# synchronous=NORMAL is durable across application crashes in WAL mode
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16384",
+)
+
+def connect(path):
+    """
+    Open a tuned connection to the SQLite database at path.
+    """
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 class ComputeDb:
+    """
+    Handle on the validator's SQLite database.
+
+    Each handle owns one connection, so handles interleaved on a thread (async request
+    handlers) keep separate transactions. Connections are taken from a process-wide pool
+    of idle ones on first use and returned to it by close(). The schema is created once
+    per process and file instead of on every construction.
+    """
+
+    # Idle connections kept per database file; the rest are closed when returned
+    MAX_IDLE_CONNECTIONS = 8
+
+    _pool_lock = threading.Lock()
+    _pool = {}
+    _pool_pid = None
+    _schema_lock = threading.Lock()
+    _initialized_paths = set()
+
     def __init__(self):
         # Connect to the database (or create it if it doesn't exist)
+        self.path = os.path.abspath(os.getenv("SQLITE_DB_PATH", "database.db"))
+        self._conn = None
         try:
-            self.conn = sqlite3.connect(os.getenv("SQLITE_DB_PATH", "database.db"), check_same_thread=False)
-            self.init()
+            with ComputeDb._schema_lock:
+                if self.path not in ComputeDb._initialized_paths and self.init():
+                    ComputeDb._initialized_paths.add(self.path)
         except (sqlite3.Error, Exception) as e:
             bt.logging.error(f"ComputeDb: Failed to connect to and initialize the SQLite database: {e}")
-            self.conn = None
+
+    @property
+    def conn(self):
+        """Connection of this handle, taken from the idle pool on first use."""
+        if self._conn is None:
+            with ComputeDb._pool_lock:
+                idle = ComputeDb._idle(self.path)
+                conn = idle.pop() if idle else None
+            self._conn = conn if conn is not None else connect(self.path)
+        return self._conn
 
     def close(self):
-        self.conn.close()
+        """Roll back anything left uncommitted and return the connection to the pool."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with ComputeDb._pool_lock:
+            idle = ComputeDb._idle(self.path)
+            if len(idle) < ComputeDb.MAX_IDLE_CONNECTIONS:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @classmethod
+    def close_connections(cls):
+        """Close every idle connection of the process."""
+        with cls._pool_lock:
+            idle = [conn for path in list(cls._pool) for conn in cls._idle(path)]
+            cls._pool = {}
+        for conn in idle:
+            conn.close()
+
+    @classmethod
+    def _idle(cls, path):
+        # Connections must not be shared with a forked child; caller holds _pool_lock
+        if cls._pool_pid != os.getpid():
+            cls._pool_pid = os.getpid()
+            cls._pool = {}
+        return cls._pool.setdefault(path, [])
 
     def get_cursor(self):
         return self.conn.cursor()
 
     def init(self):
-        cursor = self.get_cursor()
+        """
+        Bring the schema up to date by applying pending migrations.
 
+        :return: True if the schema is in place.
+        """
         try:
-            cursor.execute("CREATE TABLE IF NOT EXISTS miner (uid INTEGER PRIMARY KEY, ss58_address TEXT UNIQUE)")
-            cursor.execute("CREATE TABLE IF NOT EXISTS miner_details (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT, no_specs_count INTEGER DEFAULT 0)")
-            cursor.execute("CREATE TABLE IF NOT EXISTS tb (id INTEGER PRIMARY KEY, hotkey TEXT, details TEXT)")
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS challenge_details (
-                    uid INTEGER,
-                    ss58_address TEXT,
-                    success BOOLEAN,
-                    elapsed_time REAL,
-                    difficulty INTEGER,
-                    created_at TIMESTAMP,
-                    FOREIGN KEY (uid) REFERENCES miner(uid) ON DELETE CASCADE,
-                    FOREIGN KEY (ss58_address) REFERENCES miner(ss58_address) ON DELETE CASCADE
-                )
-            """
-            )
-            cursor.execute("CREATE TABLE IF NOT EXISTS blacklist (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT)")
-            cursor.execute("CREATE TABLE IF NOT EXISTS allocation (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_uid ON challenge_details (uid)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ss58_address ON challenge_details (ss58_address)")
-            cursor.execute("CREATE TABLE IF NOT EXISTS wandb_runs (hotkey TEXT PRIMARY KEY, run_id TEXT NOT NULL)")
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS pog_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    hotkey TEXT,
-                    gpu_name TEXT,
-                    num_gpus INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (hotkey) REFERENCES miner_details (hotkey) ON DELETE CASCADE
-                )
-            """
-            )
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS stats (
-                    uid INTEGER PRIMARY KEY,
-                    hotkey TEXT NOT NULL,
-                    gpu_specs TEXT,
-                    score REAL,
-                    allocated BOOLEAN,
-                    own_score BOOLEAN,
-                    reliability_score REAL,  -- Optional reliability score
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (hotkey) REFERENCES miner_details (hotkey) ON DELETE CASCADE
-                )
-                """
-            )
-
-            self.conn.commit()
+            migrate(self.conn)
+            return True
         except Exception as e:
-            self.conn.rollback()
             bt.logging.error(f"ComputeDb error: {e}")
-        finally:
-            cursor.close()
+            return False
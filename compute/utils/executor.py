@@ -0,0 +1,37 @@
+import atexit
+import concurrent.futures
+import multiprocessing
+import multiprocessing.util
+import sys
+
+__all__ = ["spawn_process_pool"]
+
+
+def spawn_process_pool(max_workers):
+    """
+    ProcessPoolExecutor on fresh interpreters ("spawn") whose workers exit quietly.
+
+    :param max_workers: Number of worker processes.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def _init_worker():
+    # Workers pick up bittensor through the task module or the re-imported parent __main__.
+    # Its logging QueueListener only stops from atexit, which a worker reaches after the
+    # multiprocessing finalizers have closed the listener's queue, so the listener thread
+    # dies on EOFError. Stop it first (finalizers with a higher priority run earlier).
+    multiprocessing.util.Finalize(None, _stop_bittensor_logging, exitpriority=100)
+
+
+def _stop_bittensor_logging():
+    bt = sys.modules.get("bittensor")
+    listener = getattr(getattr(bt, "logging", None), "_listener", None)
+    if listener is None or listener._thread is None:
+        return
+    atexit.unregister(listener.stop)
+    listener.stop()
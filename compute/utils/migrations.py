@@ -0,0 +1,216 @@
+"""
+Versioned schema migrations for the validator's SQLite database.
+
+Each migration runs once, in order, in its own transaction, and records its
+version in the schema_version table. New schema changes are added as a new
+migration at the end of MIGRATIONS; applied migrations are never edited.
+"""
+import bittensor as bt
+
+
+def _initial_schema(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS miner (uid INTEGER PRIMARY KEY, ss58_address TEXT UNIQUE)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS miner_details (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT, no_specs_count INTEGER DEFAULT 0)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS tb (id INTEGER PRIMARY KEY, hotkey TEXT, details TEXT)")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS challenge_details (
+            uid INTEGER,
+            ss58_address TEXT,
+            success BOOLEAN,
+            elapsed_time REAL,
+            difficulty INTEGER,
+            created_at TIMESTAMP,
+            FOREIGN KEY (uid) REFERENCES miner(uid) ON DELETE CASCADE,
+            FOREIGN KEY (ss58_address) REFERENCES miner(ss58_address) ON DELETE CASCADE
+        )
+    """
+    )
+    cursor.execute("CREATE TABLE IF NOT EXISTS blacklist (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS allocation (id INTEGER PRIMARY KEY, hotkey TEXT UNIQUE, details TEXT)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_uid ON challenge_details (uid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ss58_address ON challenge_details (ss58_address)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS wandb_runs (hotkey TEXT PRIMARY KEY, run_id TEXT NOT NULL)")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pog_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hotkey TEXT,
+            gpu_name TEXT,
+            num_gpus INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (hotkey) REFERENCES miner_details (hotkey) ON DELETE CASCADE
+        )
+    """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS stats (
+            uid INTEGER PRIMARY KEY,
+            hotkey TEXT NOT NULL,
+            gpu_specs TEXT,
+            score REAL,
+            allocated BOOLEAN,
+            own_score BOOLEAN,
+            reliability_score REAL,  -- Optional reliability score
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (hotkey) REFERENCES miner_details (hotkey) ON DELETE CASCADE
+        )
+        """
+    )
+
+
+def _miner_details_unique_hotkey(cursor):
+    # Databases from before 1.3.11 lack no_specs_count and the UNIQUE constraint on hotkey
+    columns = [column[1] for column in cursor.execute("PRAGMA table_info(miner_details)").fetchall()]
+    hotkey_unique = False
+    for _, name, unique, *_ in cursor.execute("PRAGMA index_list('miner_details')").fetchall():
+        index_columns = [column[2] for column in cursor.execute(f"PRAGMA index_info('{name}')").fetchall()]
+        if unique and index_columns == ["hotkey"]:
+            hotkey_unique = True
+            break
+    if "no_specs_count" in columns and hotkey_unique:
+        return
+
+    cursor.execute("DROP TABLE IF EXISTS new_miner_details")
+    cursor.execute(
+        """
+        CREATE TABLE new_miner_details (
+            id INTEGER PRIMARY KEY,
+            hotkey TEXT UNIQUE,
+            details TEXT,
+            no_specs_count INTEGER DEFAULT 0
+        )
+    """
+    )
+    no_specs_count = "no_specs_count" if "no_specs_count" in columns else "0"
+    # The newest row wins for duplicated hotkeys
+    cursor.execute(
+        f"""
+        INSERT OR REPLACE INTO new_miner_details (id, hotkey, details, no_specs_count)
+        SELECT id, hotkey, details, {no_specs_count} FROM miner_details ORDER BY id
+    """
+    )
+    cursor.execute("DROP TABLE miner_details")
+    cursor.execute("ALTER TABLE new_miner_details RENAME TO miner_details")
+
+
+def _pog_stats_index_and_latest(cursor):
+    # Covers the per-hotkey history reads (latest entry, oldest entry, valid specs)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pog_stats_hotkey_created_at ON pog_stats (hotkey, created_at, gpu_name, num_gpus)")
+    # Latest verified spec per hotkey, maintained by triggers on pog_stats
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pog_latest (
+            hotkey TEXT PRIMARY KEY,
+            stats_id INTEGER NOT NULL,
+            gpu_name TEXT NOT NULL,
+            num_gpus INTEGER NOT NULL,
+            verified_at TIMESTAMP
+        )
+    """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pog_latest_stats_id ON pog_latest (stats_id)")
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS pog_latest_insert AFTER INSERT ON pog_stats
+        WHEN NEW.gpu_name IS NOT NULL AND NEW.num_gpus IS NOT NULL
+        BEGIN
+            INSERT INTO pog_latest (hotkey, stats_id, gpu_name, num_gpus, verified_at)
+            VALUES (NEW.hotkey, NEW.id, NEW.gpu_name, NEW.num_gpus, NEW.created_at)
+            ON CONFLICT(hotkey) DO UPDATE SET
+                stats_id=excluded.stats_id,
+                gpu_name=excluded.gpu_name,
+                num_gpus=excluded.num_gpus,
+                verified_at=excluded.verified_at;
+        END
+    """
+    )
+    # Retention keeps the newest entries, so once the latest verified one is gone no older one is left
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS pog_latest_delete AFTER DELETE ON pog_stats
+        BEGIN
+            DELETE FROM pog_latest WHERE stats_id = OLD.id;
+        END
+    """
+    )
+    # Backfill hotkeys verified before pog_latest existed
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO pog_latest (hotkey, stats_id, gpu_name, num_gpus, verified_at)
+        SELECT hotkey, id, gpu_name, num_gpus, created_at
+        FROM (
+            SELECT id, hotkey, gpu_name, num_gpus, created_at,
+                   ROW_NUMBER() OVER (PARTITION BY hotkey ORDER BY created_at DESC, id DESC) AS row_number
+            FROM pog_stats
+            WHERE gpu_name IS NOT NULL AND num_gpus IS NOT NULL
+        )
+        WHERE row_number = 1
+    """
+    )
+
+
+def _miner_details_hash(cursor):
+    # Content hash of the stored details, so unchanged specs can be skipped on sync
+    cursor.execute("ALTER TABLE miner_details ADD COLUMN details_hash TEXT")
+
+
+# Ordered (version, description, function) entries; append only
+MIGRATIONS = (
+    (1, "initial schema", _initial_schema),
+    (2, "miner_details: unique hotkey and no_specs_count", _miner_details_unique_hotkey),
+    (3, "pog_stats (hotkey, created_at) index and pog_latest", _pog_stats_index_and_latest),
+    (4, "miner_details.details_hash", _miner_details_hash),
+)
+
+
+def get_schema_version(conn):
+    """
+    :return: Highest applied migration version, 0 for a new database.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    conn.commit()
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """
+    Apply the pending migrations in order.
+
+    Every migration runs in an IMMEDIATE transaction, so processes starting against
+    the same database at once apply it exactly once.
+
+    :param conn: sqlite3 connection.
+    :param migrations: Ordered (version, description, function) entries.
+    :return: The schema version after migrating.
+    """
+    version = get_schema_version(conn)
+    for target, description, apply in migrations:
+        if target <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            # Another process may have migrated while this one waited for the lock
+            current = cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+            if current < target:
+                apply(cursor)
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (target, description))
+                bt.logging.info(f"ComputeDb: applied schema migration {target} ({description})")
+            conn.commit()
+            version = max(current, target)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return version
@@ -1,7 +1,13 @@
+import concurrent.futures
+import queue
+import threading
+
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 
+from compute.utils.executor import spawn_process_pool
+
 
 def generate_key_pair():
     private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
@@ -26,3 +32,115 @@ def decrypt_data(private_key_pem, ciphertext):
     private_key = serialization.load_pem_private_key(private_key_pem, password=None, backend=default_backend())
     plaintext = private_key.decrypt(ciphertext, padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None))
     return plaintext.decode()
+
+
+class KeyPool:
+    """
+    Bounded queue of pre-generated RSA key pairs, refilled on a worker process.
+
+    get() hands out a ready key pair and tops the queue back up in the background; when
+    the queue has been drained faster than the worker refills it, or the worker process
+    died, a key pair is generated inline so callers never wait on the pool. A broken
+    worker pool is replaced on the next refill.
+    """
+
+    def __init__(self, size=32, workers=1):
+        self.size = size
+        self.workers = workers
+        self._keys = queue.Queue(maxsize=size)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._broken = False
+        self._executor = self._new_executor()
+        self._refill()
+
+    def _new_executor(self):
+        return spawn_process_pool(self.workers)
+
+    def get(self):
+        """
+        :return: Tuple of (private_pem, public_pem) strings, as generate_key_pair.
+        """
+        try:
+            key_pair = self._keys.get_nowait()
+        except queue.Empty:
+            key_pair = generate_key_pair()
+        self._refill()
+        return key_pair
+
+    def available(self):
+        return self._keys.qsize()
+
+    def close(self, wait=False):
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _refill(self):
+        # Submitting and registering callbacks happens outside the lock: a future that is
+        # already done (or cancelled by shutdown) runs _on_generated inline
+        while True:
+            broken_executor = None
+            with self._lock:
+                if self._closed or self._keys.qsize() + self._pending >= self.size:
+                    return
+                if self._broken:
+                    broken_executor, self._executor = self._executor, self._new_executor()
+                    self._broken = False
+                self._pending += 1
+                executor = self._executor
+            if broken_executor is not None:
+                broken_executor.shutdown(wait=False, cancel_futures=True)
+            try:
+                future = executor.submit(generate_key_pair)
+            except RuntimeError:
+                # BrokenProcessPool, or shut down by close(); get() falls back to inline keys
+                with self._lock:
+                    self._pending -= 1
+                    self._broken = not self._closed
+                return
+            future.add_done_callback(self._on_generated)
+
+    def _on_generated(self, future):
+        broken = not future.cancelled() and isinstance(future.exception(), concurrent.futures.BrokenExecutor)
+        with self._lock:
+            self._pending -= 1
+            if broken and not self._closed:
+                self._broken = True
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self._keys.put_nowait(future.result())
+        except queue.Full:
+            pass
+
+
+_key_pool = None
+
+
+def start_key_pool(size=32, workers=1):
+    """Start the process-wide key pool used by get_key_pair (no-op if already running)."""
+    global _key_pool
+    if _key_pool is None:
+        _key_pool = KeyPool(size, workers)
+    return _key_pool
+
+
+def stop_key_pool(wait=False):
+    global _key_pool
+    if _key_pool is not None:
+        _key_pool.close(wait)
+        _key_pool = None
+
+
+def get_key_pair():
+    """
+    Key pair from the process-wide pool, or generated inline if no pool was started.
+
+    :return: Tuple of (private_pem, public_pem) strings.
+    """
+    if _key_pool is None:
+        return generate_key_pair()
+    return _key_pool.get()
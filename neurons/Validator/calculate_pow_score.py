@@ -17,6 +17,7 @@
 # DEALINGS IN THE SOFTWARE.
 # Step 1: Import necessary libraries and modules
 import bittensor as bt
+import torch
 import wandb
 
 import compute
@@ -61,3 +62,29 @@ def calc_score_pog(gpu_specs, hotkey, allocated_hotkeys, config_data, mock=False
     except Exception as e:
         bt.logging.error(f"An error occurred while calculating score for the following hotkey - {hotkey}: {e}")
         return 0
+
+def build_gpu_score_lookup(config_data):
+    """
+    Precompute the per-GPU scores used by calc_scores_pog.
+
+    :return: Tuple of (GPU name -> index, score tensor). The last tensor entry is 0 for unknown GPUs.
+    """
+    gpu_scores = config_data["gpu_performance"].get("gpu_scores", {})
+    index = {gpu_name: i for i, gpu_name in enumerate(gpu_scores)}
+    max_score = max(gpu_scores.values()) * 8
+    # Same scaling as calc_score_pog: score * num_gpus * 100 / max_score, normalized to [0, 1]
+    scores = torch.tensor([*gpu_scores.values(), 0.0], dtype=torch.float32) * (100 / max_score)
+    return index, normalize(scores, 0, 100)
+
+def calc_scores_pog(gpu_specs_list, gpu_score_lookup):
+    """
+    Score many miners at once; matches calc_score_pog for each entry.
+
+    :param gpu_specs_list: List of dicts with 'gpu_name' and 'num_gpus'.
+    :param gpu_score_lookup: Output of build_gpu_score_lookup.
+    :return: Float tensor of normalized scores, one per entry (0 for unknown GPUs).
+    """
+    index, scores = gpu_score_lookup
+    gpu_index = torch.tensor([index.get(specs.get("gpu_name"), len(index)) for specs in gpu_specs_list], dtype=torch.long)
+    num_gpus = torch.tensor([prevent_none(specs.get("num_gpus")) for specs in gpu_specs_list], dtype=torch.float32)
+    return scores[gpu_index] * num_gpus.clamp(max=8)
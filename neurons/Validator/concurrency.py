@@ -0,0 +1,81 @@
+import asyncio
+import collections
+import random
+import time
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    Operations report how long their network-bound part took and whether it failed.
+    A fast success grows the limit by about one slot per limit's worth of successes;
+    a failure or a latency above latency_target multiplies it by decrease_factor.
+    Only operations started after the last decrease can shrink the limit again, so a
+    burst of failures from the same moment counts as a single congestion signal.
+    """
+
+    def __init__(self, initial_limit, min_limit=1, max_limit=64, latency_target=20.0, decrease_factor=0.7):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._waiters = collections.deque()
+
+    async def acquire(self):
+        """Wait until fewer than limit operations are in flight and take a slot."""
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def record(self, started, failed=False):
+        """
+        Feed one observation into the limit.
+
+        :param started: time.monotonic() at the start of the observed operation.
+        :param failed: Whether the operation failed (connection error, timeout, ...).
+        """
+        latency = time.monotonic() - started
+        if failed or latency > self.latency_target:
+            if started > self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self._last_decrease = time.monotonic()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+def backoff_delay(attempt, base, cap, rng=random):
+    """
+    Exponential backoff with equal jitter.
+
+    :param attempt: Number of failed attempts so far (1 for the first retry).
+    :param base: Delay before the first retry, in seconds.
+    :param cap: Upper bound on the delay, in seconds.
+    :return: A delay in [d / 2, d] with d = min(cap, base * 2 ** (attempt - 1)).
+    """
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay / 2 + rng.uniform(0, delay / 2)
@@ -15,6 +15,7 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import hashlib
 import json
 from typing import Tuple, Any
 
@@ -89,88 +90,62 @@ def update_miner_details(db: ComputeDb, hotkey_list, benchmark_responses: Tuple[
 """
 
 
+def details_hash(details):
+    """Content hash of a miner's specs, independent of key order."""
+    return hashlib.sha256(json.dumps(details, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 #  Update the miner_details with specs (hotfix for 1.3.11!)
-def update_miner_details(db: ComputeDb, hotkey_list, benchmark_responses: Tuple[str, Any]):
+def update_miner_details(db: ComputeDb, benchmark_responses: Tuple[str, Any]):
+    """
+    Bulk upsert of the miners' specs; rows whose content is unchanged are not written.
+
+    A miner without specs gets '{}' and its no_specs_count incremented, up to 5.
+
+    :param benchmark_responses: List of (hotkey, specs) tuples.
+    :return: Number of written rows.
+    """
     cursor = db.get_cursor()
     try:
-        # Update th database structure while keeping the data
-        # Check the number of columns in the miner_details table
-        cursor.execute("PRAGMA table_info(miner_details);")
-        table_info = cursor.fetchall()
-        column_count = len(table_info)
-
-        # Check if there is a UNIQUE index on the hotkey column
-        cursor.execute("PRAGMA index_list('miner_details')")
-        indices = cursor.fetchall()
-        hotkey_unique = False
-        for index in indices:
-            cursor.execute(f"PRAGMA index_info('{index[1]}')")
-            index_info = cursor.fetchall()
-            if any(column[2] == 'hotkey' for column in index_info) and index[3] == 0:
-                hotkey_unique = True
-                break
-
-        # If there are 3 columns or hotkey lacks a UNIQUE constraint, alter the table
-        if column_count == 3 or not hotkey_unique:
-            # Create a new table with the UNIQUE constraint and no_specs_count column
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS new_miner_details (
-                    id INTEGER PRIMARY KEY,
-                    hotkey TEXT UNIQUE,
-                    details TEXT,
-                    no_specs_count INTEGER DEFAULT 0
-                );
-            """)
-            # Copy data from the old table to the new table
-            cursor.execute("""
-                INSERT INTO new_miner_details (id, hotkey, details)
-                SELECT id, hotkey, details FROM miner_details;
-            """)
-            # Drop the old table
-            cursor.execute("DROP TABLE miner_details;")
-            # Rename the new table to the old table's name
-            cursor.execute("ALTER TABLE new_miner_details RENAME TO miner_details;")
-            db.conn.commit()
-
-        # Update miner_details
-        for hotkey, response in benchmark_responses:
-            # Print current values in the row before updating
-            cursor.execute("""
-                SELECT * FROM miner_details WHERE hotkey = ?;
-            """, (hotkey,))
-            current_values = cursor.fetchone()
-            # print("Current values in row before updating (hotkey:", hotkey, "):", current_values) # debugging
+        # Stored hash and no_specs_count of every miner, in one query
+        cursor.execute("SELECT hotkey, details_hash, no_specs_count FROM miner_details")
+        current = {hotkey: (stored_hash, no_specs_count) for hotkey, stored_hash, no_specs_count in cursor.fetchall()}
+        empty_hash = details_hash({})
 
+        updated, no_specs = [], []
+        for hotkey, response in benchmark_responses:
+            stored_hash, no_specs_count = current.get(hotkey, (None, None))
             if response:  # Check if the response is not empty
-                # Update the existing record with the new details or insert a new one
-                cursor.execute("""
-                    INSERT INTO miner_details (hotkey, details, no_specs_count)
-                    VALUES (?, ?, 0)
-                    ON CONFLICT(hotkey) DO UPDATE SET
-                        details = excluded.details,
-                        no_specs_count = 0;
-                """, (hotkey, json.dumps(response)))
-            else:
-                # Increment no_specs_count for the existing record or insert a new one
-                cursor.execute("""
-                    INSERT INTO miner_details (hotkey, details, no_specs_count)
-                    VALUES (?, '{}', 1)
-                    ON CONFLICT(hotkey) DO UPDATE SET
-                        no_specs_count =
-                            CASE
-                                WHEN miner_details.no_specs_count >= 5 THEN 5
-                                ELSE miner_details.no_specs_count + 1
-                            END,
-                        details =
-                            CASE
-                                WHEN miner_details.no_specs_count >= 5 THEN '{}'
-                                ELSE excluded.details
-                            END;
-                """, (hotkey, '{}'))
+                new_hash = details_hash(response)
+                if new_hash != stored_hash or no_specs_count != 0:
+                    updated.append((hotkey, json.dumps(response), new_hash))
+            elif stored_hash != empty_hash or no_specs_count is None or no_specs_count < 5:
+                no_specs.append((hotkey, empty_hash))
+
+        # Update the existing record with the new details or insert a new one
+        cursor.executemany("""
+            INSERT INTO miner_details (hotkey, details, details_hash, no_specs_count)
+            VALUES (?, ?, ?, 0)
+            ON CONFLICT(hotkey) DO UPDATE SET
+                details = excluded.details,
+                details_hash = excluded.details_hash,
+                no_specs_count = 0;
+        """, updated)
+        # Increment no_specs_count for the existing record or insert a new one
+        cursor.executemany("""
+            INSERT INTO miner_details (hotkey, details, details_hash, no_specs_count)
+            VALUES (?, '{}', ?, 1)
+            ON CONFLICT(hotkey) DO UPDATE SET
+                no_specs_count = MIN(miner_details.no_specs_count + 1, 5),
+                details = excluded.details,
+                details_hash = excluded.details_hash;
+        """, no_specs)
         db.conn.commit()
+        return len(updated) + len(no_specs)
     except Exception as e:
         db.conn.rollback()
         bt.logging.error(f"Error while updating miner_details: {e}")
+        return 0
     finally:
         cursor.close()
 
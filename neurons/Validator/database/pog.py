@@ -23,8 +23,9 @@ from compute.utils.db import ComputeDb
 
 def update_pog_stats(db: ComputeDb, hotkey, gpu_name, num_gpus):
         """
-        Inserts a new GPU spec entry for a given hotkey and ensures that only
-        the latest three entries are retained.
+        Inserts a new GPU spec entry for a given hotkey. A verified entry also
+        becomes the hotkey's pog_latest row; old entries are removed in bulk by
+        trim_pog_stats.
 
         :param hotkey: The miner's hotkey identifier.
         :param gpu_name: The name/model of the GPU.
@@ -41,21 +42,6 @@ def update_pog_stats(db: ComputeDb, hotkey, gpu_name, num_gpus):
                 (hotkey, gpu_name, num_gpus)
             )
 
-            # Delete older entries if more than 4 exist for the hotkey
-            cursor.execute(
-                """
-                DELETE FROM pog_stats
-                WHERE id NOT IN (
-                    SELECT id FROM pog_stats
-                    WHERE hotkey = ?
-                    ORDER BY created_at DESC
-                    LIMIT 4
-                )
-                AND hotkey = ?
-                """,
-                (hotkey, hotkey)
-            )
-
             db.conn.commit()
             # bt.logging.info(f"Updated pog_stats for hotkey: {hotkey}")
         except Exception as e:
@@ -64,6 +50,37 @@ def update_pog_stats(db: ComputeDb, hotkey, gpu_name, num_gpus):
         finally:
             cursor.close()
 
+def trim_pog_stats(db: ComputeDb, keep=4):
+    """
+    Retention job: keeps only the newest entries of every hotkey in pog_stats.
+
+    :param keep: Number of entries retained per hotkey.
+    :return: Number of deleted entries.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(
+            """
+            DELETE FROM pog_stats
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY hotkey ORDER BY created_at DESC, id DESC) AS row_number
+                    FROM pog_stats
+                )
+                WHERE row_number > ?
+            )
+            """,
+            (keep,)
+        )
+        db.conn.commit()
+        return cursor.rowcount
+    except Exception as e:
+        db.conn.rollback()
+        bt.logging.error(f"Failed to trim pog_stats: {e}")
+        return 0
+    finally:
+        cursor.close()
+
 def get_pog_specs(db: ComputeDb, hotkey):
     """
     Retrieves the most recent GPU spec entry for a given hotkey where gpu_name is not None.
@@ -76,10 +93,8 @@ def get_pog_specs(db: ComputeDb, hotkey):
         cursor.execute(
             """
             SELECT gpu_name, num_gpus
-            FROM pog_stats
-            WHERE hotkey = ? AND gpu_name IS NOT NULL AND num_gpus IS NOT NULL
-            ORDER BY created_at DESC
-            LIMIT 1
+            FROM pog_latest
+            WHERE hotkey = ?
             """,
             (hotkey,)
         )
@@ -97,6 +112,65 @@ def get_pog_specs(db: ComputeDb, hotkey):
     finally:
         cursor.close()
 
+def get_latest_pog_specs(db: ComputeDb):
+    """
+    Retrieves the most recent valid GPU spec entry of every hotkey in a single query.
+
+    :return: A dictionary mapping hotkey to {'gpu_name', 'num_gpus'}; hotkeys without a valid entry are absent.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute("SELECT hotkey, gpu_name, num_gpus FROM pog_latest")
+        return {hotkey: {"gpu_name": gpu_name, "num_gpus": num_gpus} for hotkey, gpu_name, num_gpus in cursor.fetchall()}
+    except Exception as e:
+        bt.logging.error(f"Failed to retrieve latest pog_stats: {e}")
+        return {}
+    finally:
+        cursor.close()
+
+def purge_pog_stats(db: ComputeDb, hotkeys):
+    """
+    Deletes the pog_stats entries of the given hotkeys in one transaction.
+
+    :param hotkeys: Iterable of miner hotkeys.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.executemany("DELETE FROM pog_stats WHERE hotkey = ?", [(hotkey,) for hotkey in hotkeys])
+        db.conn.commit()
+    except Exception as e:
+        db.conn.rollback()
+        bt.logging.error(f"Failed to purge pog_stats: {e}")
+    finally:
+        cursor.close()
+
+def get_pog_history(db: ComputeDb):
+    """
+    Retrieves the recorded Proof-of-GPU results of every hotkey, newest first.
+
+    :return: A dictionary mapping hotkey to a list of (gpu_name, num_gpus, created_at) tuples,
+             where gpu_name and num_gpus are None for failed tests and created_at is a UTC datetime.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT hotkey, gpu_name, num_gpus, created_at
+            FROM pog_stats
+            ORDER BY hotkey, created_at DESC, id DESC
+            """
+        )
+        history = {}
+        for hotkey, gpu_name, num_gpus, created_at in cursor.fetchall():
+            created_at = datetime.datetime.fromisoformat(created_at).replace(tzinfo=datetime.timezone.utc)
+            history.setdefault(hotkey, []).append((gpu_name, num_gpus, created_at))
+        return history
+    except Exception as e:
+        bt.logging.error(f"Failed to retrieve pog_stats history: {e}")
+        return {}
+    finally:
+        cursor.close()
+
 def write_stats(self, stats):
     cursor = self.get_cursor()
     try:
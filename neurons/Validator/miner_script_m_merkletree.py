@@ -10,13 +10,21 @@ import hashlib
 from multiprocessing.pool import ThreadPool
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
+import contextlib
 import json
 import gc
+import struct
 
 os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "max_split_size_mb:512"
 
-import subprocess
-import sys
+# Binary proof response layout, must match parse_responses in pog.py:
+# header (magic, version, hash_size, num_indices, row_length, proof_length), then
+# num_indices x (i, j) uint32, num_indices x row_length float32 (the opened row
+# chunk) and num_indices x proof_length x hash_size sibling hashes, all little-endian.
+RESPONSE_MAGIC = b"POGR"
+RESPONSE_VERSION = 1
+RESPONSE_HEADER = struct.Struct("<4sHHIII")
+HASH_SIZE = 32
 
 def get_gpu_info():
     """
@@ -32,8 +40,7 @@ def get_gpu_info():
     gpu_names = [torch.cuda.get_device_name(i) for i in range(num_gpus)]
 
     gpu_info = {"num_gpus": num_gpus, "gpu_names": gpu_names}
-
-    print(json.dumps(gpu_info, indent=2))
+    return gpu_info
 
 def estimate_vram_size(buffer_factor=0.9, precision="fp16"):
     dtype = torch.float16 if precision == "fp16" else torch.float32
@@ -56,6 +63,24 @@ def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     aligned_size = (max_size // 32) * 32  # Ensure alignment to multiple of 32
     return aligned_size
 
+def proof_matrix_size(vram, chunk_size=None):
+    """
+    Size of the seeded matrices used for the Merkle proof.
+
+    Args:
+        vram (float): Estimated VRAM in GB.
+        chunk_size (int): Width of the row chunks committed as Merkle leaves, if any.
+
+    Returns:
+        tuple: (n, chunk_size) with n a multiple of chunk_size when chunking.
+    """
+    n = adjust_matrix_size(vram, element_size=4, buffer_factor=0.10)
+    if chunk_size:
+        # Keep all row chunks the same width
+        chunk_size = min(chunk_size, n)
+        n = (n // chunk_size) * chunk_size
+    return n, chunk_size
+
 def get_seeds():
     """Read n and seeds from /tmp/seeds.txt."""
     if not os.path.exists('/tmp/seeds.txt'):
@@ -91,44 +116,224 @@ def get_challenge_indices():
     return indices
 
 
-def build_merkle_tree_rows(C, hash_func=hashlib.sha256, num_threads=None):
+def get_hash_func(hash_algorithm="sha256"):
+    """
+    Return the Merkle hash constructor for the algorithm requested by the validator.
+
+    BLAKE3 hashers are created with max_threads=AUTO so large rows are hashed with
+    BLAKE3's own multithreading; blake3 is only imported when it is requested.
+    """
+    if hash_algorithm == "sha256":
+        return hashlib.sha256
+    if hash_algorithm == "blake3":
+        try:
+            import blake3
+        except ImportError:
+            raise RuntimeError("blake3 is not installed on this miner.")
+        return lambda data=b"": blake3.blake3(data, max_threads=blake3.blake3.AUTO)
+    raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+
+def merkle_tree_size(num_leaves):
+    """Total number of nodes in a tree with num_leaves leaves, odd levels padded by duplication."""
+    size = num_leaves
+    while num_leaves > 1:
+        num_leaves = (num_leaves + 1) // 2
+        size += num_leaves
+    return size
+
+def hash_messages(messages, out, hash_func=hashlib.sha256, pool=None, num_threads=8):
+    """
+    Hash every row of a 2-D uint8 array into the matching row of out.
+
+    Rows are split into num_threads contiguous ranges so each pool task hashes many
+    messages and writes its digests back in one slice assignment.
+    """
+    num_messages = len(messages)
+
+    def hash_range(bounds):
+        start, end = bounds
+        digests = b"".join(hash_func(messages[k]).digest() for k in range(start, end))
+        out[start:end] = np.frombuffer(digests, dtype=np.uint8).reshape(end - start, HASH_SIZE)
+
+    step = max(1, -(-num_messages // num_threads))
+    ranges = [(start, min(start + step, num_messages)) for start in range(0, num_messages, step)]
+    if pool is None or len(ranges) == 1:
+        for bounds in ranges:
+            hash_range(bounds)
+    else:
+        pool.map(hash_range, ranges)
+
+def build_merkle_levels(tree, num_leaves, hash_func=hashlib.sha256, pool=None, num_threads=8):
+    """
+    Fill the levels of tree above its first num_leaves rows, in place.
+
+    Levels are stored one after another. An even level is reshaped into (left || right)
+    pairs without copying; an odd level's last node is paired with itself. tree may also
+    be a stack of same-shaped trees, (num_trees, num_nodes, 32), built level by level
+    with one hash_messages call per level.
+    """
+    offset = 0
+    while num_leaves > 1:
+        level = tree[..., offset:offset + num_leaves, :]
+        if num_leaves % 2:
+            level = np.concatenate([level, level[..., -1:, :]], axis=-2)
+        num_parents = (num_leaves + 1) // 2
+        parents = tree[..., offset + num_leaves:offset + num_leaves + num_parents, :]
+        if parents.flags.c_contiguous:
+            hash_messages(level.reshape(-1, 2 * HASH_SIZE), parents.reshape(-1, HASH_SIZE), hash_func, pool, num_threads)
+        else:
+            digests = np.empty((parents.size // HASH_SIZE, HASH_SIZE), dtype=np.uint8)
+            hash_messages(level.reshape(-1, 2 * HASH_SIZE), digests, hash_func, pool, num_threads)
+            parents[...] = digests.reshape(parents.shape)
+        offset += num_leaves
+        num_leaves = num_parents
+    return tree
+
+def build_merkle_tree(leaves, hash_func=hashlib.sha256):
+    """
+    Build a Merkle tree sequentially over a small list of leaf digests.
+
+    Uses the same layout as build_merkle_tree_rows, so get_merkle_proof_row works on the result.
+    """
+    num_leaves = len(leaves)
+    tree = np.empty((merkle_tree_size(num_leaves), HASH_SIZE), dtype=np.uint8)
+    tree[:num_leaves] = np.frombuffer(b"".join(leaves), dtype=np.uint8).reshape(num_leaves, HASH_SIZE)
+    build_merkle_levels(tree, num_leaves, hash_func)
+    return tree[-1].tobytes(), tree
+
+def build_row_chunk_tree(row, chunk_size, hash_func=hashlib.sha256):
+    """
+    Build the Merkle tree over the chunk_size-wide chunks of one row.
+
+    Its root is the row's leaf in build_merkle_tree_rows. With a single chunk the
+    root is simply the hash of the whole row.
+    """
+    leaves = [hash_func(row[k:k + chunk_size].tobytes()).digest() for k in range(0, len(row), chunk_size)]
+    return build_merkle_tree(leaves, hash_func)
+
+def build_merkle_tree_rows(C, hash_func=hashlib.sha256, num_threads=None, chunk_size=None):
+    """
+    Build the Merkle tree over the rows of C.
+
+    Returns:
+        tuple: (root_hash, tree) where tree is a contiguous (num_nodes, 32) uint8 array
+        holding the leaves followed by each level up to the root.
+    """
     if num_threads is None:
         num_threads = 8
 
     n = C.shape[0]
+    tree = np.empty((merkle_tree_size(n), HASH_SIZE), dtype=np.uint8)
 
-    # Hash each row of C using the specified hash function
-    def hash_row(i):
-        return hash_func(C[i, :].tobytes()).digest()
-
-    # Parallelize row hashing
+    # One pool serves the leaves and every level
     with ThreadPool(num_threads) as pool:
-        leaves = pool.map(hash_row, range(n))
+        hash_row_leaves(C, tree[:n], hash_func, chunk_size, pool, num_threads)
+        build_merkle_levels(tree, n, hash_func, pool, num_threads)
+
+    return tree[-1].tobytes(), tree
+
+def hash_row_leaves(rows, out, hash_func=hashlib.sha256, chunk_size=None, pool=None, num_threads=8, block_rows=1024):
+    """Write the Merkle leaf of each row of the float32 array rows into out."""
+    num_rows, row_length = rows.shape
+    chunk_size = chunk_size or row_length
+    if chunk_size >= row_length:
+        # Hash each row straight from its bytes
+        hash_messages(np.ascontiguousarray(rows).view(np.uint8).reshape(num_rows, -1), out, hash_func, pool, num_threads)
+        return
+    if row_length % chunk_size:
+        raise ValueError(f"Row length {row_length} is not a multiple of the chunk size {chunk_size}.")
+    # A row split into chunks is committed to by the root of its chunk tree. The chunk
+    # trees of a block of rows are built side by side, one hash_messages call per level
+    num_chunks = row_length // chunk_size
+    chunk_trees = np.empty((min(block_rows, num_rows), merkle_tree_size(num_chunks), HASH_SIZE), dtype=np.uint8)
+    for start in range(0, num_rows, block_rows):
+        end = min(start + block_rows, num_rows)
+        trees = chunk_trees[:end - start]
+        chunks = np.ascontiguousarray(rows[start:end]).view(np.uint8).reshape((end - start) * num_chunks, -1)
+        leaves = np.empty((len(chunks), HASH_SIZE), dtype=np.uint8)
+        hash_messages(chunks, leaves, hash_func, pool, num_threads)
+        trees[:, :num_chunks] = leaves.reshape(end - start, num_chunks, HASH_SIZE)
+        build_merkle_levels(trees, num_chunks, hash_func, pool, num_threads)
+        out[start:end] = trees[:, -1]
+
+def stream_rows_to_host(C_torch, C_out, leaves_out, hash_func=hashlib.sha256, chunk_size=None, pool=None, num_threads=8, block_rows=1024):
+    """
+    Copy C to host memory in row blocks while hashing the blocks already copied.
 
-    tree = leaves.copy()
-    num_leaves = len(leaves)
-    offset = 0
+    On a GPU, blocks go through two pinned buffers on a side stream: block k + 1 is
+    in flight while block k is written to C_out and its leaves are hashed. CPU
+    tensors take the same path with plain views, which keeps it testable without a GPU.
 
-    # Function to hash pairs of nodes using the specified hash function
-    def hash_pair(i):
-        left = tree[offset + i]
-        if i + 1 < num_leaves:
-            right = tree[offset + i + 1]
-        else:
-            right = left  # Duplicate if odd number of leaves
-        return hash_func(left + right).digest()
+    Args:
+        C_torch (torch.Tensor): float32 result matrix.
+        C_out (np.ndarray): Host array (e.g. a memmap) of the same shape receiving C.
+        leaves_out (np.ndarray): (n, 32) uint8 array receiving the row leaves.
+        hash_func (callable): Merkle hash function.
+        chunk_size (int): Width of the row chunks committed as Merkle leaves (default: whole rows).
+        pool (ThreadPool): Pool used for hashing, if any.
+        num_threads (int): Number of hashing tasks per block.
+        block_rows (int): Rows per transfer block.
+    """
+    n = C_torch.shape[0]
+    blocks = [(start, min(start + block_rows, n)) for start in range(0, n, block_rows)]
+
+    if C_torch.is_cuda:
+        stream = torch.cuda.Stream(device=C_torch.device)
+        # The side stream must see C fully computed
+        stream.wait_stream(torch.cuda.current_stream(C_torch.device))
+        buffers = [torch.empty((block_rows, C_torch.shape[1]), dtype=C_torch.dtype, pin_memory=True) for _ in range(2)]
+        events = [torch.cuda.Event() for _ in range(2)]
+
+        def issue(k):
+            start, end = blocks[k]
+            with torch.cuda.stream(stream):
+                buffers[k % 2][:end - start].copy_(C_torch[start:end], non_blocking=True)
+                events[k % 2].record(stream)
+
+        def wait(k):
+            start, end = blocks[k]
+            events[k % 2].synchronize()
+            return buffers[k % 2][:end - start].numpy()
+    else:
+        def issue(k):
+            pass
+
+        def wait(k):
+            start, end = blocks[k]
+            return C_torch[start:end].numpy()
+
+    if blocks:
+        issue(0)
+    for k, (start, end) in enumerate(blocks):
+        # Buffer (k + 1) % 2 held block k - 1, which was fully consumed last iteration
+        if k + 1 < len(blocks):
+            issue(k + 1)
+        block = wait(k)
+        C_out[start:end] = block
+        hash_row_leaves(block, leaves_out[start:end], hash_func, chunk_size, pool, num_threads)
+
+def build_merkle_tree_streamed(C_torch, C_out, hash_func=hashlib.sha256, num_threads=None, chunk_size=None, block_rows=1024):
+    """
+    Pipelined variant of build_merkle_tree_rows that also moves C to the host.
 
-    # Build the Merkle tree
-    while num_leaves > 1:
-        with ThreadPool(num_threads) as pool:
-            # Process pairs of leaves
-            new_level = pool.map(hash_pair, range(0, num_leaves, 2))
-        tree.extend(new_level)
-        offset += num_leaves
-        num_leaves = len(new_level)
+    Returns:
+        tuple: (root_hash, tree, streaming_time) with root_hash and tree identical to
+        build_merkle_tree_rows(C), and streaming_time the wall time of the overlapped
+        transfer and leaf hashing.
+    """
+    if num_threads is None:
+        num_threads = 8
+
+    n = C_torch.shape[0]
+    tree = np.empty((merkle_tree_size(n), HASH_SIZE), dtype=np.uint8)
+
+    with ThreadPool(num_threads) as pool:
+        start_time = time.time()
+        stream_rows_to_host(C_torch, C_out, tree[:n], hash_func, chunk_size, pool, num_threads, block_rows)
+        streaming_time = time.time() - start_time
+        build_merkle_levels(tree, n, hash_func, pool, num_threads)
 
-    root_hash = tree[-1]
-    return root_hash, tree
+    return tree[-1].tobytes(), tree, streaming_time
 
 def get_merkle_proof_row(tree, row_index, total_leaves):
     proof = []
@@ -141,7 +346,7 @@ def get_merkle_proof_row(tree, row_index, total_leaves):
             sibling_hash = tree[offset + sibling_idx]
         else:
             sibling_hash = tree[offset + idx]  # Duplicate if sibling is missing
-        proof.append(sibling_hash)
+        proof.append(bytes(sibling_hash))
         idx = idx // 2
         offset += num_leaves
         num_leaves = (num_leaves + 1) // 2
@@ -156,30 +361,54 @@ def xorshift32_torch(state):
     x = x & 0xFFFFFFFF
     return x
 
-def generate_matrix_torch(s, n):
+def generate_matrix_torch(s, n, block_elements=1 << 22):
+    """
+    Generate the seeded n x n PRNG matrix.
+
+    The matrix is filled in row blocks of about block_elements entries, with row and
+    column indices broadcast instead of materialised, so scratch memory stays O(n)
+    rather than several n^2 int64 tensors. Values are bit-identical to computing the
+    whole matrix at once.
+
+    Args:
+        s (int): 64-bit seed.
+        n (int): Size of the matrix.
+        block_elements (int): Target number of entries generated per block.
+
+    Returns:
+        torch.Tensor: float32 matrix on the GPU if available, otherwise on the CPU.
+    """
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
     dtype = torch.int64
 
-    # Prepare indices
-    i_indices = torch.arange(n, dtype=dtype, device=device).repeat_interleave(n)
-    j_indices = torch.arange(n, dtype=dtype, device=device).repeat(n)
-
     # Convert s to signed 64-bit integer
     s_signed = (s + 2**63) % 2**64 - 2**63
     s_tensor = torch.tensor(s_signed, dtype=dtype, device=device)
 
-    # Modify the computation to prevent overflow
-    # Since 4294967296 mod 2^32 is 0, we can adjust the computation
-    i_mod = i_indices % (2**32)
-    states = (s_tensor + i_mod + j_indices) & 0xFFFFFFFF
+    # Since 4294967296 mod 2^32 is 0, row indices can be taken mod 2^32; n is far below that
+    j_indices = torch.arange(n, dtype=dtype, device=device)
+    block_rows = max(1, block_elements // max(n, 1))
+
+    matrix = torch.empty((n, n), dtype=torch.float32, device=device)
+    for row_start in range(0, n, block_rows):
+        row_end = min(row_start + block_rows, n)
+        i_indices = torch.arange(row_start, row_end, dtype=dtype, device=device)
+        states = ((s_tensor + i_indices).unsqueeze(1) + j_indices) & 0xFFFFFFFF
 
-    for _ in range(10):
-        states = xorshift32_torch(states)
+        for _ in range(10):
+            states = xorshift32_torch(states)
 
-    matrix = (states.float() / float(0xFFFFFFFF)).reshape(n, n)
+        matrix[row_start:row_end] = states.float() / float(0xFFFFFFFF)
+        del states
     return matrix
 
-def run_benchmark():
+def benchmark():
+    """
+    Estimate VRAM and time one fp16 and one fp32 matmul.
+
+    Returns:
+        tuple: (num_gpus, estimated_vram, size_fp16, time_fp16, size_fp32, time_fp32)
+    """
     # Detect number of GPUs
     num_gpus = torch.cuda.device_count()
 
@@ -194,9 +423,56 @@ def run_benchmark():
     elapsed_time_fp16 = benchmark_matrix_multiplication(matrix_size_fp16, precision="fp16")
     elapsed_time_fp32 = benchmark_matrix_multiplication(matrix_size_fp32, precision="fp32")
 
+    # Release the probe and benchmark buffers held by the caching allocator
+    torch.cuda.empty_cache()
+
+    return num_gpus, estimated_vram, matrix_size_fp16, elapsed_time_fp16, matrix_size_fp32, elapsed_time_fp32
+
+def run_benchmark():
+    num_gpus, estimated_vram, matrix_size_fp16, elapsed_time_fp16, matrix_size_fp32, elapsed_time_fp32 = benchmark()
+
     # Output results
     print(f"{num_gpus} {estimated_vram:.2f} {matrix_size_fp16} {elapsed_time_fp16:.6f} {matrix_size_fp32} {elapsed_time_fp32:.6f}")
 
+def benchmark_compute(seeds, chunk_size=None, leaf_hashing="cpu", hash_algorithm="sha256"):
+    """
+    Benchmark and compute in one pass.
+
+    The VRAM probe and CUDA context are shared by both phases, and the seeded fp32
+    matmul of the compute phase is the fp32 timing sample, so no separate random fp32
+    benchmark is run.
+
+    Args:
+        seeds (dict): Mapping of gpu_id to (s_A, s_B).
+        chunk_size (int): Width of the row chunks committed as Merkle leaves (default: whole rows).
+        leaf_hashing (str): How C is copied back and hashed, "cpu" or "pipelined" (see process_gpu).
+        hash_algorithm (str): Merkle hash algorithm, "sha256" or "blake3".
+
+    Returns:
+        tuple: (benchmark_results, root_hashes, gpu_timings), with benchmark_results laid out
+        as in benchmark() and the fp32 size/time taken from the seeded matmul.
+    """
+    if not torch.cuda.is_available():
+        raise RuntimeError("No GPU detected.")
+
+    num_gpus = torch.cuda.device_count()
+    estimated_vram = estimate_vram_size(buffer_factor=1.0, precision="fp16")
+
+    matrix_size_fp16 = adjust_matrix_size(estimated_vram, element_size=2, buffer_factor=1.0)
+    elapsed_time_fp16 = benchmark_matrix_multiplication(matrix_size_fp16, precision="fp16")
+    torch.cuda.empty_cache()
+
+    n, chunk_size = proof_matrix_size(estimated_vram, chunk_size)
+    root_hashes, gpu_timings = compute(n, seeds, chunk_size, leaf_hashing, hash_algorithm)
+    if not gpu_timings:
+        raise RuntimeError("Compute failed on every GPU.")
+
+    # The slowest GPU bounds the fp32 throughput, as the single-device benchmark did
+    elapsed_time_fp32 = max(timing['multiplication_time'] for _, timing in gpu_timings)
+
+    benchmark_results = (num_gpus, estimated_vram, matrix_size_fp16, elapsed_time_fp16, n, elapsed_time_fp32)
+    return benchmark_results, root_hashes, gpu_timings
+
 def benchmark_matrix_multiplication(size, precision="fp16"):
     dtype = torch.float16 if precision == "fp16" else torch.float32
     A = torch.randn(size, size, dtype=dtype, device="cuda")
@@ -209,7 +485,7 @@ def benchmark_matrix_multiplication(size, precision="fp16"):
     elapsed_time = time.time() - start_time
     return elapsed_time
 
-def process_gpu(gpu_id, s_A, s_B, n):
+def process_gpu(gpu_id, s_A, s_B, n, chunk_size=None, leaf_hashing="cpu", hash_algorithm="sha256"):
     """
     Process computations for a single GPU.
 
@@ -218,6 +494,10 @@ def process_gpu(gpu_id, s_A, s_B, n):
         s_A (int): Seed for matrix A.
         s_B (int): Seed for matrix B.
         n (int): Size of the matrices.
+        chunk_size (int): Width of the row chunks committed as Merkle leaves (default: whole rows).
+        leaf_hashing (str): "cpu" to copy C back and then hash its rows, or "pipelined" to
+            overlap the copy with row hashing block by block.
+        hash_algorithm (str): Merkle hash algorithm, "sha256" or "blake3".
 
     Returns:
         tuple: (root_hash_result, gpu_timing_result)
@@ -254,20 +534,31 @@ def process_gpu(gpu_id, s_A, s_B, n):
         gpu_timing['multiplication_time'] = multiplication_time
         print(f"GPU {gpu_id}: Matrix multiplication time on GPU: {multiplication_time:.2f} seconds")
 
-        # Step 4: Move C back to CPU for Merkle tree construction
-        start_time_transfer_back = time.time()
-        C = C_torch.cpu().numpy()
-        end_time_transfer_back = time.time()
-        transfer_back_time = end_time_transfer_back - start_time_transfer_back
-        gpu_timing['transfer_back_time'] = transfer_back_time
-        # Optional: Uncomment to log transfer time
-        # print(f"GPU {gpu_id}: Data transfer from GPU time: {transfer_back_time:.2f} seconds")
-
-        # Step 5: Construct Merkle tree over rows of C
-        start_time_merkle = time.time()
-        root_hash, merkle_tree = build_merkle_tree_rows(C)
-        end_time_merkle = time.time()
-        merkle_tree_time = end_time_merkle - start_time_merkle
+        hash_func = get_hash_func(hash_algorithm)
+        if leaf_hashing == "pipelined":
+            # Step 4/5: Stream C back in row blocks, hashing each block while the next is in flight;
+            # transfer_back_time covers the overlapped phase, merkle_tree_time the levels above it
+            C = np.lib.format.open_memmap(f'/dev/shm/C_gpu_{gpu_id}.npy', mode='w+', dtype=np.float32, shape=tuple(C_torch.shape))
+            start_time_merkle = time.time()
+            root_hash, merkle_tree, transfer_back_time = build_merkle_tree_streamed(C_torch, C, hash_func, chunk_size=chunk_size)
+            merkle_tree_time = time.time() - start_time_merkle - transfer_back_time
+            gpu_timing['transfer_back_time'] = transfer_back_time
+        else:
+            # Step 4: Move C back to CPU straight into a .npy in shared memory, so proof
+            # mode can memory-map it instead of keeping or re-reading a second copy
+            start_time_transfer_back = time.time()
+            C = np.lib.format.open_memmap(f'/dev/shm/C_gpu_{gpu_id}.npy', mode='w+', dtype=np.float32, shape=tuple(C_torch.shape))
+            torch.from_numpy(C).copy_(C_torch)
+            end_time_transfer_back = time.time()
+            transfer_back_time = end_time_transfer_back - start_time_transfer_back
+            gpu_timing['transfer_back_time'] = transfer_back_time
+            # Optional: Uncomment to log transfer time
+            # print(f"GPU {gpu_id}: Data transfer from GPU time: {transfer_back_time:.2f} seconds")
+
+            # Step 5: Construct Merkle tree over rows of C
+            start_time_merkle = time.time()
+            root_hash, merkle_tree = build_merkle_tree_rows(C, hash_func, chunk_size=chunk_size)
+            merkle_tree_time = time.time() - start_time_merkle
         gpu_timing['merkle_tree_time'] = merkle_tree_time
         # Optional: Uncomment to log Merkle tree construction time and root hash
         # print(f"GPU {gpu_id}: Merkle tree over rows construction time: {merkle_tree_time:.2f} seconds")
@@ -277,9 +568,9 @@ def process_gpu(gpu_id, s_A, s_B, n):
         root_hash_result = (gpu_id, root_hash.hex())
         gpu_timing_result = (gpu_id, gpu_timing)
 
-        # Save Merkle tree and C for later proof generation
+        # Save Merkle tree for later proof generation; C is already in shared memory
         np.save(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', merkle_tree)
-        np.save(f'/dev/shm/C_gpu_{gpu_id}.npy', C)
+        C.flush()
 
         # Free GPU memory
         del A_torch, B_torch, C_torch, C, merkle_tree
@@ -292,20 +583,26 @@ def process_gpu(gpu_id, s_A, s_B, n):
         print(f"Error processing GPU {gpu_id}: {e}")
         return None, None
 
-def run_compute():
+def compute(n, seeds, chunk_size=None, leaf_hashing="cpu", hash_algorithm="sha256"):
     """
     Run compute operations on all available GPUs in parallel.
+
+    Args:
+        n (int): Size of the matrices.
+        seeds (dict): Mapping of gpu_id to (s_A, s_B).
+        chunk_size (int): Width of the row chunks committed as Merkle leaves (default: whole rows).
+        leaf_hashing (str): How C is copied back and hashed, "cpu" or "pipelined" (see process_gpu).
+        hash_algorithm (str): Merkle hash algorithm, "sha256" or "blake3".
+
+    Returns:
+        tuple: (root_hashes, gpu_timings) as lists of (gpu_id, value) pairs.
     """
     if not torch.cuda.is_available():
-        print("Error: No GPU detected.")
-        sys.exit(1)
+        raise RuntimeError("No GPU detected.")
 
     # Detect number of GPUs
     num_gpus = torch.cuda.device_count()
 
-    # Read n and seeds
-    n, seeds = get_seeds()
-
     # Initialize lists to store root hashes and timings per GPU
     root_hashes = []
     gpu_timings = []
@@ -316,7 +613,7 @@ def run_compute():
         futures = []
         for gpu_id in range(num_gpus):
             s_A, s_B = seeds[gpu_id]
-            futures.append(executor.submit(process_gpu, gpu_id, s_A, s_B, n))
+            futures.append(executor.submit(process_gpu, gpu_id, s_A, s_B, n, chunk_size, leaf_hashing, hash_algorithm))
 
         for future in as_completed(futures):
             root_hash_result, gpu_timing_result = future.result()
@@ -325,57 +622,171 @@ def run_compute():
             if gpu_timing_result:
                 gpu_timings.append(gpu_timing_result)
 
+    return root_hashes, gpu_timings
+
+def run_compute():
+    if not torch.cuda.is_available():
+        print("Error: No GPU detected.")
+        sys.exit(1)
+
+    # Read n and seeds
+    n, seeds = get_seeds()
+    root_hashes, gpu_timings = compute(n, seeds)
+
     # Output root hashes and timings
     print(f"Root hashes: {json.dumps(root_hashes)}")
     print(f"Timings: {json.dumps(gpu_timings)}")
 
-def run_proof_gpu(gpu_id, indices, num_gpus):
+def run_proof_gpu(gpu_id, indices, num_gpus, chunk_size=None, hash_algorithm="sha256"):
     # Set the GPU device
     torch.cuda.set_device(gpu_id)
 
     # Load data for the specific GPU
     gpu_indices = indices[gpu_id]
-    merkle_tree = np.load(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', allow_pickle=True)
-    C = np.load(f'/dev/shm/C_gpu_{gpu_id}.npy')
+    merkle_tree = np.load(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', mmap_mode='r')
+    # Only the challenged rows are paged in
+    C = np.load(f'/dev/shm/C_gpu_{gpu_id}.npy', mmap_mode='r')
 
     # Start proof generation
     start_time_proof = time.time()
-    responses = {'rows': [], 'proofs': [], 'indices': gpu_indices}
+    rows = []
+    proofs = []
     total_leaves = C.shape[0]
+    chunk_size = chunk_size or C.shape[1]
 
     for idx, (i, j) in enumerate(gpu_indices):
+        # Open only the chunk containing column j: its path in the row's chunk tree,
+        # followed by the row's path in the main tree
+        c = j // chunk_size
         row = C[i, :]
-        proof = get_merkle_proof_row(merkle_tree, i, total_leaves)
-        responses['rows'].append(row)
-        responses['proofs'].append(proof)
+        _, chunk_tree = build_row_chunk_tree(row, chunk_size, get_hash_func(hash_algorithm))
+        num_chunks = (C.shape[1] + chunk_size - 1) // chunk_size
+        rows.append(row[c * chunk_size:(c + 1) * chunk_size])
+        proofs.append(get_merkle_proof_row(chunk_tree, c, num_chunks) + get_merkle_proof_row(merkle_tree, i, total_leaves))
 
     end_time_proof = time.time()
     proof_time = end_time_proof - start_time_proof
     print(f"GPU {gpu_id}: Proof generation time: {proof_time:.2f} seconds")
 
     # Save responses to shared memory
-    np.save(f'/dev/shm/responses_gpu_{gpu_id}.npy', responses)
+    with open(f'/dev/shm/responses_gpu_{gpu_id}.bin', 'wb') as f:
+        f.write(pack_responses(gpu_indices, rows, proofs))
 
-def run_proof():
-    # Get the challenge indices
-    indices = get_challenge_indices()
+def pack_responses(indices, rows, proofs):
+    """
+    Serialise proof responses into the fixed binary layout described by RESPONSE_HEADER.
+
+    Args:
+        indices (list): Challenge indices as (i, j) tuples.
+        rows (list): Row of C for each index.
+        proofs (list): Merkle proof (list of sibling hashes) for each index.
+
+    Returns:
+        bytes: The packed responses.
+    """
+    num_indices = len(indices)
+    row_length = len(rows[0]) if num_indices else 0
+    proof_length = len(proofs[0]) if num_indices else 0
+    header = RESPONSE_HEADER.pack(RESPONSE_MAGIC, RESPONSE_VERSION, HASH_SIZE, num_indices, row_length, proof_length)
+    return b"".join([
+        header,
+        np.asarray(indices, dtype="<u4").tobytes(),
+        np.asarray(rows, dtype="<f4").tobytes(),
+        # Fixed-width S32 restores any trailing zero bytes numpy strips from loaded hashes
+        np.asarray(proofs, dtype=f"S{HASH_SIZE}").tobytes(),
+    ])
+
+def proof(indices, chunk_size=None, hash_algorithm="sha256"):
+    """
+    Generate the Merkle proofs for the challenge indices of every GPU.
+
+    Args:
+        indices (dict): Mapping of gpu_id to a list of (i, j) tuples.
+        chunk_size (int): Width of the row chunks committed as Merkle leaves (default: whole rows).
+        hash_algorithm (str): Merkle hash algorithm used in compute mode.
+    """
     num_gpus = torch.cuda.device_count()
 
     # Use ThreadPoolExecutor for parallel GPU processing
     with ThreadPoolExecutor(max_workers=num_gpus) as executor:
         futures = [
-            executor.submit(run_proof_gpu, gpu_id, indices, num_gpus)
+            executor.submit(run_proof_gpu, gpu_id, indices, num_gpus, chunk_size, hash_algorithm)
             for gpu_id in range(num_gpus)
         ]
         # Wait for all threads to complete
         for future in futures:
             future.result()  # To raise any exceptions that occurred in the threads
 
+def run_proof():
+    # Get the challenge indices
+    indices = get_challenge_indices()
+    proof(indices)
+
+def read_frame(stream):
+    """Read one length-prefixed JSON frame, or return None at end of stream."""
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (length,) = struct.unpack(">I", header)
+    return json.loads(stream.read(length))
+
+def write_frame(stream, message):
+    """Write one length-prefixed JSON frame."""
+    payload = json.dumps(message).encode()
+    stream.write(struct.pack(">I", len(payload)) + payload)
+    stream.flush()
+
+def run_agent():
+    """
+    Serve every Proof-of-GPU phase from one long-lived process.
+
+    Requests and responses are frames made of a 4-byte big-endian length followed by
+    a JSON payload, exchanged over stdin/stdout. A request is {"cmd": ..., **args}; the
+    response is {"ok": true, "result": ...} or {"ok": false, "error": ...}. Imports and
+    the CUDA context are paid once for the whole test instead of once per phase.
+    """
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    handlers = {
+        "gpu_info": lambda request: get_gpu_info(),
+        "benchmark": lambda request: benchmark(),
+        "compute": lambda request: compute(
+            request["n"],
+            {int(gpu_id): tuple(seeds) for gpu_id, seeds in request["seeds"].items()},
+            request.get("chunk_size"),
+            request.get("leaf_hashing", "cpu"),
+            request.get("hash_algorithm", "sha256"),
+        ),
+        "benchmark_compute": lambda request: benchmark_compute(
+            {int(gpu_id): tuple(seeds) for gpu_id, seeds in request["seeds"].items()},
+            request.get("chunk_size"),
+            request.get("leaf_hashing", "cpu"),
+            request.get("hash_algorithm", "sha256"),
+        ),
+        "proof": lambda request: proof(
+            {int(gpu_id): [tuple(idx) for idx in idx_list] for gpu_id, idx_list in request["indices"].items()},
+            request.get("chunk_size"),
+            request.get("hash_algorithm", "sha256"),
+        ),
+    }
+
+    # Keep stdout reserved for frames; progress prints go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        while True:
+            request = read_frame(stdin)
+            if request is None or request.get("cmd") == "exit":
+                break
+            try:
+                handler = handlers[request["cmd"]]
+                write_frame(stdout, {"ok": True, "result": handler(request)})
+            except Exception as e:
+                write_frame(stdout, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Miner script for GPU proof.')
     parser.add_argument('--mode', type=str, default='benchmark',
-                        choices=['benchmark', 'compute', 'proof', 'gpu_info'],
-                        help='Mode to run: benchmark, compute, proof, or gpu_info')
+                        choices=['benchmark', 'compute', 'proof', 'gpu_info', 'agent'],
+                        help='Mode to run: benchmark, compute, proof, gpu_info, or agent')
     args = parser.parse_args()
 
     if args.mode == 'benchmark':
@@ -385,4 +796,6 @@ if __name__ == "__main__":
     elif args.mode == 'proof':
         run_proof()
     elif args.mode == 'gpu_info':
-        get_gpu_info()
+        print(json.dumps(get_gpu_info(), indent=2))
+    elif args.mode == 'agent':
+        run_agent()
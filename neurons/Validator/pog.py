@@ -1,4 +1,4 @@
-import paramiko
+import asyncio
 import hashlib
 import numpy as np
 import os
@@ -6,11 +6,17 @@ import time
 import blake3
 import secrets  # For secure random seed generation
 import json
-import tempfile
+import struct
 import yaml
 import torch
 import bittensor as bt
 
+# Binary proof response layout written by pack_responses in the miner script
+RESPONSE_MAGIC = b"POGR"
+RESPONSE_VERSION = 1
+RESPONSE_HEADER = struct.Struct("<4sHHIII")  # magic, version, hash_size, num_indices, row_length, proof_length
+HASH_SIZE = 32  # SHA-256 and BLAKE3 digest size
+
 def load_yaml_config(file_path):
     """
     Load GPU performance data from a YAML file.
@@ -72,14 +78,70 @@ def identify_gpu(fp16_tflops, fp32_tflops, estimated_avram, gpu_data, reported_n
 
     return identified_gpu
 
+def check_timing(elapsed_time, time_fp16, gpu_timings, n, size_fp16, gpu_name, gpu_data, merkle_proof):
+    """
+    Check the timings of a benchmark_compute request against the identified GPU.
+
+    Every phase the miner reports is capped at a limit derived from n and the identified
+    GPU alone: the matmuls at matmul_time_tolerance times 2 n^3 / TFLOPS, generation at
+    2 n^2 / generation_rate and copy-back plus Merkle hashing at 4 n^2 / hashing_rate.
+    The request's wall-clock time must then fit the fp16 benchmark plus the slowest GPU's
+    capped phases (GPUs run concurrently), with time_tolerance seconds for the VRAM probe
+    and the round trip, so inflated reports cannot buy more time than the caps. A seeded
+    fp32 matmul slower than its cap fails outright.
+
+    Parameters:
+        elapsed_time (float): Wall-clock time of the request measured by the validator.
+        time_fp16 (float): Reported fp16 benchmark time.
+        gpu_timings (list): (gpu_id, timing) pairs reported by the miner.
+        n (int): Size of the seeded matrices, as sized by the validator.
+        size_fp16 (int): Size of the fp16 benchmark matrices, as sized by the validator.
+        gpu_name (str): Identified GPU.
+        gpu_data (dict): gpu_performance section of config.yaml.
+        merkle_proof (dict): merkle_proof section of config.yaml.
+
+    Returns:
+        bool: True if every matmul is fast enough and the request fits its budget.
+    """
+    tflops_fp16 = gpu_data["GPU_TFLOPS_FP16"].get(gpu_name)
+    tflops_fp32 = gpu_data["GPU_TFLOPS_FP32"].get(gpu_name)
+    if not gpu_timings or not tflops_fp16 or not tflops_fp32:
+        return False
+    time_tolerance = merkle_proof.get("time_tolerance", 5)
+    matmul_tolerance = merkle_proof.get("matmul_time_tolerance", 2.0)
+
+    max_fp16_time = matmul_tolerance * 2 * size_fp16 ** 3 / (tflops_fp16 * 1e12)
+    max_generation_time = 2 * n ** 2 / merkle_proof.get("generation_rate", 1e9)
+    max_multiplication_time = matmul_tolerance * 2 * n ** 3 / (tflops_fp32 * 1e12)
+    max_hashing_time = 4 * n ** 2 / merkle_proof.get("hashing_rate", 2e8)
+
+    phase_times = []
+    for gpu_id, timing in gpu_timings:
+        multiplication_time = timing.get('multiplication_time', 0.0)
+        if multiplication_time > max_multiplication_time:
+            bt.logging.trace(
+                f"[Timing] GPU {gpu_id}: Matrix multiplication took {multiplication_time:.4f} s, "
+                f"expected at most {max_multiplication_time:.4f} s."
+            )
+            return False
+        hashing_time = timing.get('transfer_back_time', 0.0) + timing.get('merkle_tree_time', 0.0)
+        phase_times.append(
+            min(timing.get('generation_time', 0.0), max_generation_time) + multiplication_time
+            + min(hashing_time, max_hashing_time)
+        )
+
+    budget = time_tolerance + min(time_fp16, max_fp16_time) + max(phase_times)
+    if elapsed_time >= budget:
+        bt.logging.trace(f"[Timing] Request took {elapsed_time:.2f} s, budget was {budget:.2f} s.")
+        return False
+    return True
+
 def compute_script_hash(script_path):
     with open(script_path, "rb") as f:
         return hashlib.sha256(f.read()).hexdigest()
 
-def send_script_and_request_hash(ssh_client, script_path):
-    sftp = ssh_client.open_sftp()
-    sftp.put(script_path, "/tmp/miner_script.py")
-    sftp.close()
+async def send_script_and_request_hash(transport, script_path):
+    await transport.put(script_path, "/tmp/miner_script.py")
 
     # Command to compute the hash on the remote server
     hash_command = """
@@ -90,60 +152,63 @@ with open('/tmp/miner_script.py', 'rb') as f:
 print(computed_hash)
 "
     """
-    stdin, stdout, stderr = ssh_client.exec_command(hash_command)
-    computed_hash = stdout.read().decode().strip()
-    hash_error = stderr.read().decode().strip()
+    computed_hash, hash_error = await transport.run(hash_command)
 
     if hash_error:
         raise RuntimeError(f"Hash computation failed: {hash_error}")
     return computed_hash
 
-def execute_script_on_miner(ssh_client, mode):
-    execution_command = f"/opt/conda/bin/python /tmp/miner_script.py --mode {mode}"
-    stdin, stdout, stderr = ssh_client.exec_command(execution_command)
-    execution_output = stdout.read().decode().strip()
-    execution_error = stderr.read().decode().strip()
+class MinerScriptSession:
+    """
+    Long-lived miner script running in agent mode over a single SSH channel.
 
-    if execution_error:
-        raise RuntimeError(f"Script execution failed: {execution_error}")
-    return execution_output
+    Requests and responses are length-prefixed JSON frames (see run_agent in the
+    miner script), so every Proof-of-GPU phase reuses the same remote process,
+    its imports and its CUDA context. Use MinerScriptSession.start to create one.
+    """
 
-def parse_benchmark_output(output):
-    try:
-        parts = output.strip().split()
-        num_gpus = int(parts[0])  # First value is the number of GPUs
-        vram = float(parts[1])
-        size_fp16 = int(parts[2])
-        time_fp16 = float(parts[3])
-        size_fp32 = int(parts[4])
-        time_fp32 = float(parts[5])
-        return num_gpus, vram, size_fp16, time_fp16, size_fp32, time_fp32
-    except (ValueError, IndexError) as e:
-        raise ValueError(f"Failed to parse execution output: {output}") from e
-
-def parse_merkle_output(output):
-    try:
-        lines = output.strip().split('\n')
-        root_hashes_line = None
-        timings_line = None
-        for line in lines:
-            if line.startswith('Root hashes:'):
-                root_hashes_line = line
-            elif line.startswith('Timings:'):
-                timings_line = line
-        if root_hashes_line is None or timings_line is None:
-            raise ValueError("Output does not contain root hashes or timings")
-        # Parse root hashes
-        root_hashes_str = root_hashes_line.split(': ', 1)[1]
-        root_hashes = json.loads(root_hashes_str)  # List of tuples (gpu_id, root_hash)
-
-        # Parse timings
-        timings_str = timings_line.split(': ', 1)[1]
-        gpu_timings = json.loads(timings_str)  # List of tuples (gpu_id, timings_dict)
-
-        return root_hashes, gpu_timings
-    except (ValueError, IndexError, json.JSONDecodeError) as e:
-        raise ValueError(f"Failed to parse execution output: {output}") from e
+    def __init__(self, process):
+        self.process = process
+        self.stdin = process.stdin
+        self.stdout = process.stdout
+        self.stderr = process.stderr
+
+    @classmethod
+    async def start(cls, transport, python_path="/opt/conda/bin/python", script_path="/tmp/miner_script.py"):
+        process = await transport.open_process(f"{python_path} {script_path} --mode agent")
+        return cls(process)
+
+    async def request(self, cmd, **kwargs):
+        """
+        Send one request to the agent and wait for its response.
+
+        :param cmd: Name of the phase to run (gpu_info, benchmark, compute or proof).
+        :param kwargs: JSON-serialisable arguments of the phase.
+        :return: The result returned by the agent.
+        """
+        payload = json.dumps({"cmd": cmd, **kwargs}).encode()
+        self.stdin.write(struct.pack(">I", len(payload)) + payload)
+        await self.stdin.drain()
+
+        try:
+            header = await self.stdout.readexactly(4)
+            (length,) = struct.unpack(">I", header)
+            response = json.loads(await self.stdout.readexactly(length))
+        except asyncio.IncompleteReadError:
+            error = (await self.stderr.read()).decode().strip()
+            raise RuntimeError(f"Miner agent exited during '{cmd}': {error}")
+        if not response.get("ok"):
+            raise RuntimeError(f"Miner agent failed during '{cmd}': {response.get('error')}")
+        return response["result"]
+
+    async def close(self):
+        try:
+            payload = json.dumps({"cmd": "exit"}).encode()
+            self.stdin.write(struct.pack(">I", len(payload)) + payload)
+            await self.stdin.drain()
+            self.stdin.write_eof()
+        except Exception:
+            pass
 
 def get_random_seeds(num_gpus):
     seeds = {}
@@ -153,79 +218,196 @@ def get_random_seeds(num_gpus):
         seeds[gpu_id] = (s_A, s_B)
     return seeds
 
-def send_seeds(ssh_client, seeds, n):
-    lines = [str(n)]  # First line is n
-    for gpu_id in seeds.keys():
-        s_A, s_B = seeds[gpu_id]
-        line = f"{gpu_id} {s_A} {s_B}"
-        lines.append(line)
-    content = '\n'.join(lines)
-    command = f"echo '{content}' > /tmp/seeds.txt"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
-    stdout.channel.recv_exit_status()
-
-def send_challenge_indices(ssh_client, indices):
-    lines = []
-    for gpu_id in indices.keys():
-        idx_list = indices[gpu_id]
-        indices_str = ';'.join([f"{i},{j}" for i, j in idx_list])
-        line = f"{gpu_id} {indices_str}"
-        lines.append(line)
-    content = '\n'.join(lines)
-    command = f"echo '{content}' > /tmp/challenge_indices.txt"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
-    stdout.channel.recv_exit_status()
-
-def receive_responses(ssh_client, num_gpus):
-    responses = {}
-    try:
-        with ssh_client.open_sftp() as sftp, tempfile.TemporaryDirectory() as temp_dir:
-            for gpu_id in range(num_gpus):
-                remote_path = f'/dev/shm/responses_gpu_{gpu_id}.npy'
-                local_path = f'{temp_dir}/responses_gpu_{gpu_id}.npy'
-
-                try:
-                    sftp.get(remote_path, local_path)
-                    response = np.load(local_path, allow_pickle=True)
-                    responses[gpu_id] = response.item()
-                except Exception as e:
-                    print(f"Error processing GPU {gpu_id}: {e}")
-                    responses[gpu_id] = None
-    except Exception as e:
-        print(f"SFTP connection error: {e}")
-
-    return responses
-
-def xorshift32_numpy(state):
-    state = np.uint64(state)
-    x = state & np.uint64(0xFFFFFFFF)
-    x ^= (np.uint64((x << np.uint64(13)) & np.uint64(0xFFFFFFFF)))
-    x ^= (np.uint64((x >> np.uint64(17)) & np.uint64(0xFFFFFFFF)))
-    x ^= (np.uint64((x << np.uint64(5)) & np.uint64(0xFFFFFFFF)))
-    x = x & np.uint64(0xFFFFFFFF)
-    return x
-
-def generate_prng_value(s, i, j):
-    s = np.uint64(s)
-    i = np.uint64(i % np.uint64(2**32))
-    j = np.uint64(j)
-    state = (s + i + j) & np.uint64(0xFFFFFFFF)
+def get_random_indices(num_gpus, n, num_indices):
+    """
+    Sample the (i, j) cells of C each GPU has to open.
+
+    Parameters:
+        num_gpus (int): Number of GPUs to challenge.
+        n (int): Size of the matrices.
+        num_indices (int): Number of cells to challenge per GPU.
+
+    Returns:
+        dict: Mapping of gpu_id to a list of (i, j) tuples.
+    """
+    indices = {}
+    for gpu_id in range(num_gpus):
+        idx = np.random.randint(0, n, size=(num_indices, 2))
+        indices[gpu_id] = [(int(i), int(j)) for i, j in idx]
+    return indices
+
+async def receive_responses(transport, num_gpus, max_size=None):
+    """
+    Fetch every GPU's binary response file concurrently over the transport into memory.
+
+    Parameters:
+        transport (Transport): Connected transport of the miner.
+        num_gpus (int): Number of response files to fetch.
+        max_size (int): Largest accepted response in bytes (see response_size); larger
+            files are rejected without being read.
+
+    Returns:
+        dict: Mapping of gpu_id to the raw response bytes, or None if it could not be fetched.
+    """
+    async def receive_response(gpu_id):
+        remote_path = f'/dev/shm/responses_gpu_{gpu_id}.bin'
+        try:
+            return await transport.read_file(remote_path, max_size=max_size)
+        except Exception as e:
+            bt.logging.trace(f"Error receiving response of GPU {gpu_id}: {e}")
+            return None
+
+    results = await asyncio.gather(*(receive_response(gpu_id) for gpu_id in range(num_gpus)))
+    return dict(enumerate(results))
+
+def response_size(num_indices, n, chunk_size=None):
+    """
+    Size in bytes of a well-formed proof response for num_indices challenged cells.
+
+    Parameters:
+        num_indices (int): Number of challenged cells per GPU.
+        n (int): Size of the matrices.
+        chunk_size (int): Width of the opened row chunks (default: whole rows).
+
+    Returns:
+        int: Header, indices, row chunks and Merkle proofs, as laid out by pack_responses.
+    """
+    chunk_size = chunk_size or n
+    num_chunks = (n + chunk_size - 1) // chunk_size
+    proof_length = merkle_depth(num_chunks) + merkle_depth(n)
+    return RESPONSE_HEADER.size + num_indices * (2 * 4 + chunk_size * 4 + proof_length * HASH_SIZE)
+
+def parse_responses(data, row_length=None):
+    """
+    Parse a binary proof response without copying its payload.
+
+    Parameters:
+        data (bytes-like): Response written by pack_responses in the miner script.
+        row_length (int): Expected width of the opened rows or row chunks, if known.
+
+    Returns:
+        dict: 'indices' as a (k, 2) uint32 array, 'rows' as a (k, row_length) float32 array and
+        'proofs' as a (k, proof_length, hash_size) uint8 array, all views over data.
+
+    Raises:
+        ValueError: If the header is unknown, does not match the digest size or row_length,
+        or the payload size does not match it.
+    """
+    view = memoryview(data)
+    if len(view) < RESPONSE_HEADER.size:
+        raise ValueError("Response is too short")
+    magic, version, hash_size, num_indices, header_row_length, proof_length = RESPONSE_HEADER.unpack_from(view)
+    if magic != RESPONSE_MAGIC or version != RESPONSE_VERSION:
+        raise ValueError(f"Unknown response format {magic!r} v{version}")
+    if hash_size != HASH_SIZE:
+        raise ValueError(f"Unexpected hash size {hash_size}")
+    if row_length is not None and header_row_length != row_length:
+        raise ValueError(f"Unexpected row length {header_row_length}, expected {row_length}")
+    row_length = header_row_length
+
+    indices_size = num_indices * 2 * 4
+    rows_size = num_indices * row_length * 4
+    proofs_size = num_indices * proof_length * hash_size
+    if len(view) != RESPONSE_HEADER.size + indices_size + rows_size + proofs_size:
+        raise ValueError("Response size does not match its header")
+
+    offset = RESPONSE_HEADER.size
+    indices = np.frombuffer(view, dtype="<u4", count=num_indices * 2, offset=offset).reshape(num_indices, 2)
+    offset += indices_size
+    rows = np.frombuffer(view, dtype="<f4", count=num_indices * row_length, offset=offset).reshape(num_indices, row_length)
+    offset += rows_size
+    proofs = np.frombuffer(view, dtype=np.uint8, count=proofs_size, offset=offset).reshape(num_indices, proof_length, hash_size)
+    return {"indices": indices, "rows": rows, "proofs": proofs}
+
+def xorshift32_numpy_array(states):
+    """
+    Vectorised xorshift32 over a uint64 array, mirroring xorshift32_torch in the miner script.
+    """
+    mask = np.uint64(0xFFFFFFFF)
+    x = states & mask
+    x ^= (x << np.uint64(13)) & mask
+    x ^= (x >> np.uint64(17)) & mask
+    x ^= (x << np.uint64(5)) & mask
+    return x & mask
+
+def generate_prng_block(s, row_indices, col_indices):
+    """
+    Generate the PRNG matrix entries at the intersection of the given rows and columns.
+
+    The output is bit-identical to the matching entries of generate_matrix_torch(s, n)
+    in the miner script, without materialising the full n x n matrix.
+
+    Parameters:
+        s (int): Seed of the matrix.
+        row_indices (array-like): Row indices to generate.
+        col_indices (array-like): Column indices to generate.
+
+    Returns:
+        np.ndarray: float32 array of shape (len(row_indices), len(col_indices)).
+    """
+    mask = np.uint64(0xFFFFFFFF)
+    rows = np.asarray(row_indices, dtype=np.uint64).reshape(-1, 1) & mask
+    cols = np.asarray(col_indices, dtype=np.uint64).reshape(1, -1)
+    states = (np.uint64(s & 0xFFFFFFFF) + rows + cols) & mask
 
     for _ in range(10):
-        state = xorshift32_numpy(state)
+        states = xorshift32_numpy_array(states)
+
+    # Same rounding as the miner: int -> float32 first, then a float32 division
+    return states.astype(np.float32) / np.float32(0xFFFFFFFF)
+
+def generate_prng_rows(s, row_indices, n):
+    """Generate full rows of the PRNG matrix as a (len(row_indices), n) float32 array."""
+    return generate_prng_block(s, row_indices, np.arange(n, dtype=np.uint64))
+
+def generate_prng_cols(s, col_indices, n):
+    """Generate full columns of the PRNG matrix as a (n, len(col_indices)) float32 array."""
+    return generate_prng_block(s, np.arange(n, dtype=np.uint64), col_indices)
 
-    return state / float(0xFFFFFFFF)
+def compute_challenged_values(s_A, s_B, gpu_indices, n):
+    """
+    Compute only the challenged C_{i,j} = A[i, :] . B[:, j] cells of C = A @ B.
+
+    Every challenged row of A and column of B is regenerated as one block; the dot
+    products are accumulated in float64 so the validator's own rounding stays far
+    below the verification tolerance at production n.
+
+    Returns:
+        np.ndarray: float64 values, one per (i, j) in gpu_indices.
+    """
+    A_rows = generate_prng_rows(s_A, [i for i, _ in gpu_indices], n)
+    B_cols = generate_prng_cols(s_B, [j for _, j in gpu_indices], n)
+    return (A_rows * B_cols.T).sum(axis=1, dtype=np.float64)
+
+HASH_FUNCTIONS = {
+    "sha256": hashlib.sha256,
+    "blake3": blake3.blake3,
+}
+
+def get_hash_func(hash_algorithm):
+    """
+    Look up the Merkle hash function for the configured merkle_proof.hash_algorithm.
+
+    Raises:
+        ValueError: If the algorithm is not supported.
+    """
+    try:
+        return HASH_FUNCTIONS[hash_algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
 
-def verify_responses(seeds, root_hashes, responses, indices, n):
+def verify_responses(seeds, root_hashes, responses, indices, n, chunk_size=None, hash_algorithm="sha256"):
     """
     Verifies the responses from GPUs by checking computed values and Merkle proofs.
 
     Parameters:
         seeds (dict): Seeds used for generating PRNG values for each GPU.
         root_hashes (dict): Merkle root hashes for each GPU.
-        responses (dict): Responses from each GPU containing computed rows and proofs.
+        responses (dict): Binary responses from each GPU (see parse_responses).
         indices (dict): Challenge indices for each GPU.
         n (int): Total number of leaves in the Merkle tree.
+        chunk_size (int): Width of the row chunks opened by the miner (default: whole rows).
+        hash_algorithm (str): Merkle hash algorithm the miner was asked to use (see HASH_FUNCTIONS).
 
     Returns:
         bool: True if verification passes within the allowed failure threshold, False otherwise.
@@ -233,6 +415,10 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
     verification_passed = True
     failed_gpus = []
     num_gpus = len(root_hashes.keys())
+    hash_func = get_hash_func(hash_algorithm)
+    chunk_size = chunk_size or n
+    num_chunks = (n + chunk_size - 1) // chunk_size
+    proof_length = merkle_depth(num_chunks) + merkle_depth(n)
 
     # Define the minimum number of GPUs that must pass verification
     if num_gpus == 4:
@@ -254,27 +440,34 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
 
         gpu_failed = False  # Flag to track if the current GPU has failed
 
-        for idx, (i, j) in enumerate(gpu_indices):
-            # Generate only the necessary row and column entries using PRNG
-            A_row = np.array([generate_prng_value(s_A, i, col) for col in range(n)], dtype=np.float32)
-            B_col = np.array([generate_prng_value(s_B, row, j) for row in range(n)], dtype=np.float32)
+        try:
+            response = parse_responses(response, row_length=chunk_size)
+            if (
+                response['proofs'].shape[1] != proof_length
+                or not np.array_equal(response['indices'], np.asarray(gpu_indices))
+            ):
+                raise ValueError("Response does not match the challenge")
+        except (TypeError, ValueError) as e:
+            bt.logging.trace(f"[Verification] GPU {gpu_id}: Invalid response: {e}")
+            failed_gpus.append(gpu_id)
+            continue
 
-            # Compute C_{i,j} as the dot product of A_row and B_col
-            value_validator = np.dot(A_row, B_col)
+        values_validator = compute_challenged_values(s_A, s_B, gpu_indices, n)
 
+        for idx, (i, j) in enumerate(gpu_indices):
             # Retrieve miner's computed value and corresponding Merkle proof
-            row_miner = response['rows'][idx]
+            chunk_miner = response['rows'][idx]
             proof = response['proofs'][idx]
-            value_miner = row_miner[j]
+            value_miner = chunk_miner[j % chunk_size]
 
             # Check if the miner's value matches the expected value
-            if not np.isclose(value_miner, value_validator, atol=1e-5):
+            if not np.isclose(value_miner, values_validator[idx], atol=1e-5):
                 bt.logging.trace(f"[Verification] GPU {gpu_id}: Value mismatch at index ({i}, {j}).")
                 gpu_failed = True
                 break  # Exit the loop for this GPU as it has already failed
 
-            # Verify the Merkle proof for the row
-            if not verify_merkle_proof_row(row_miner, proof, bytes.fromhex(root_hash), i, total_leaves):
+            # Verify the Merkle proof for the row chunk
+            if not verify_merkle_proof_chunk(chunk_miner, proof, bytes.fromhex(root_hash), i, j // chunk_size, total_leaves, num_chunks, hash_func):
                 bt.logging.trace(f"[Verification] GPU {gpu_id}: Invalid Merkle proof at index ({i}).")
                 gpu_failed = True
                 break  # Exit the loop for this GPU as it has already failed
@@ -302,41 +495,74 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
 
     return verification_passed
 
-def verify_merkle_proof_row(row, proof, root_hash, index, total_leaves, hash_func=hashlib.sha256):
+def merkle_depth(num_leaves):
+    """Number of sibling hashes in a Merkle proof for a tree with num_leaves leaves."""
+    depth = 0
+    while num_leaves > 1:
+        num_leaves = (num_leaves + 1) // 2
+        depth += 1
+    return depth
+
+def compute_merkle_root(leaf_hash, proof, index, hash_func=hashlib.sha256):
     """
-    Verifies a Merkle proof for a given row.
+    Walk a Merkle proof up from a leaf digest.
 
     Parameters:
-    - row (np.ndarray): The data row to verify.
-    - proof (list of bytes): The list of sibling hashes required for verification.
-    - root_hash (bytes): The root hash of the Merkle tree.
-    - index (int): The index of the row in the tree.
-    - total_leaves (int): The total number of leaves in the Merkle tree.
+    - leaf_hash (bytes): Digest of the leaf.
+    - proof (list of bytes or np.ndarray): The sibling hashes, from the leaf level up.
+    - index (int): The index of the leaf in its level.
     - hash_func (callable): The hash function to use (default: hashlib.sha256).
 
     Returns:
-    - bool: True if the proof is valid, False otherwise.
+    - bytes: The root implied by the proof.
     """
-    # Initialize the computed hash with the hash of the row using the specified hash function
-    computed_hash = hash_func(row.tobytes()).digest()
+    computed_hash = leaf_hash
     idx = index
-    num_leaves = total_leaves
 
     # Iterate through each sibling hash in the proof
     for sibling_hash in proof:
+        # Feed both halves to the hasher so bytes and array views work without concatenating
+        hasher = hash_func()
         if idx % 2 == 0:
-            # If the current index is even, concatenate computed_hash + sibling_hash
-            combined = computed_hash + sibling_hash
+            # If the current index is even, hash computed_hash + sibling_hash
+            hasher.update(computed_hash)
+            hasher.update(sibling_hash)
         else:
-            # If the current index is odd, concatenate sibling_hash + computed_hash
-            combined = sibling_hash + computed_hash
-        # Compute the new hash using the specified hash function
-        computed_hash = hash_func(combined).digest()
+            # If the current index is odd, hash sibling_hash + computed_hash
+            hasher.update(sibling_hash)
+            hasher.update(computed_hash)
+        computed_hash = hasher.digest()
         # Move up to the next level
         idx = idx // 2
 
-    # Compare the computed hash with the provided root hash
-    return computed_hash == root_hash
+    return computed_hash
+
+def verify_merkle_proof_chunk(chunk, proof, root_hash, row_index, chunk_index, total_leaves, num_chunks, hash_func=hashlib.sha256):
+    """
+    Verifies a Merkle proof for one chunk of a row.
+
+    Each row leaf is the root of a tree over the row's chunks, so the proof holds the
+    chunk's path in that tree followed by the row's path in the main tree. With a single
+    chunk per row the chunk is the whole row and the proof is the row's path.
+
+    Parameters:
+    - chunk (np.ndarray): The opened row chunk.
+    - proof (list of bytes or np.ndarray): Chunk path followed by row path.
+    - root_hash (bytes): The root hash of the Merkle tree.
+    - row_index (int): The index of the row in the tree.
+    - chunk_index (int): The index of the chunk in its row.
+    - total_leaves (int): The total number of rows in the Merkle tree.
+    - num_chunks (int): The number of chunks per row.
+    - hash_func (callable): The hash function to use (default: hashlib.sha256).
+
+    Returns:
+    - bool: True if the proof is valid, False otherwise.
+    """
+    chunk_depth = merkle_depth(num_chunks)
+    if len(proof) != chunk_depth + merkle_depth(total_leaves):
+        return False
+    row_leaf = compute_merkle_root(hash_func(np.ascontiguousarray(chunk).view(np.uint8)).digest(), proof[:chunk_depth], chunk_index, hash_func)
+    return compute_merkle_root(row_leaf, proof[chunk_depth:], row_index, hash_func) == root_hash
 
 def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     usable_vram = vram * buffer_factor * 1e9  # Usable VRAM in bytes
@@ -344,23 +570,20 @@ def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     aligned_size = (max_size // 32) * 32  # Ensure alignment to multiple of 32
     return aligned_size
 
-def get_remote_gpu_info(ssh_client):
+def proof_matrix_size(vram, chunk_size=None):
     """
-    Execute the miner script in gpu_info mode to get GPU information from the remote miner.
+    Size of the seeded matrices used for the Merkle proof; mirrors the miner script.
 
     Args:
-        ssh_client (paramiko.SSHClient): SSH client connected to the miner.
+        vram (float): Estimated VRAM in GB.
+        chunk_size (int): Width of the row chunks committed as Merkle leaves, if any.
 
     Returns:
-        dict: Dictionary containing GPU information (number and names).
+        tuple: (n, chunk_size) with n a multiple of chunk_size when chunking.
     """
-    command = "/opt/conda/bin/python /tmp/miner_script.py --mode gpu_info"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
-
-    output = stdout.read().decode().strip()
-    error = stderr.read().decode().strip()
-
-    if error:
-        raise RuntimeError(f"Failed to get GPU info: {error}")
-
-    return json.loads(output)
+    n = adjust_matrix_size(vram, element_size=4, buffer_factor=0.10)
+    if chunk_size:
+        # Keep all row chunks the same width
+        chunk_size = min(chunk_size, n)
+        n = (n // chunk_size) * chunk_size
+    return n, chunk_size
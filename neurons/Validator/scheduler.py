@@ -0,0 +1,75 @@
+import datetime
+
+# Scheduling classes, tested in this order
+NEW, FAILED, DUE = 0, 1, 2
+
+
+def stable_streak(history):
+    """
+    Count the newest consecutive verified results identical to the latest one.
+
+    :param history: Rows of (gpu_name, num_gpus, created_at) for one hotkey, newest first.
+    :return: 0 if the latest test failed or there is no history.
+    """
+    if not history or history[0][0] is None:
+        return 0
+    latest = history[0][:2]
+    streak = 0
+    for gpu_name, num_gpus, _ in history:
+        if (gpu_name, num_gpus) != latest:
+            break
+        streak += 1
+    return streak
+
+
+def retest_interval(streak, base_interval, max_stretch=4):
+    """Interval before re-testing a miner: doubled per repeated identical result, capped at max_stretch rounds."""
+    return base_interval * min(2 ** max(streak - 1, 0), max_stretch)
+
+
+def schedule_pog_targets(axons, history, gpu_scores, base_interval, max_stretch=4, now=None):
+    """
+    Order the miners of a Proof-of-GPU round and drop the ones that are not due yet.
+
+    New hotkeys come first, then miners whose latest test failed (most valuable GPUs
+    first), then miners whose verification is due, most urgent first. Urgency is the
+    age of the latest verification relative to its re-test interval, weighted by the
+    score of the verified GPUs. A miner is due once less than half a round remains
+    until its interval expires, so a one-round interval means every round.
+
+    :param axons: Candidate axons in UID order.
+    :param history: Output of get_pog_history.
+    :param gpu_scores: GPU name to score mapping from the config.
+    :param base_interval: Seconds between Proof-of-GPU rounds.
+    :param max_stretch: Maximum re-test interval of a stable miner, in rounds.
+    :param now: Current UTC datetime (defaults to now).
+    :return: List of due axons, highest priority first.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    max_score = max(gpu_scores.values(), default=0) or 1.0
+
+    def value(gpu_name, num_gpus):
+        return gpu_scores.get(gpu_name, 0) * (num_gpus or 0) / max_score
+
+    scheduled = []
+    for order, axon in enumerate(axons):
+        rows = history.get(axon.hotkey)
+        if not rows:
+            scheduled.append(((NEW, 0.0, order), axon))
+            continue
+
+        gpu_name, num_gpus, created_at = rows[0]
+        if gpu_name is None:
+            last_verified = next(((name, count) for name, count, _ in rows if name is not None), (None, 0))
+            scheduled.append(((FAILED, -value(*last_verified), order), axon))
+            continue
+
+        interval = retest_interval(stable_streak(rows), base_interval, max_stretch)
+        age = (now - created_at).total_seconds()
+        if age < interval - base_interval / 2:
+            continue
+        urgency = age / interval * (1 + value(gpu_name, num_gpus))
+        scheduled.append(((DUE, -urgency, order), axon))
+
+    scheduled.sort(key=lambda item: item[0])
+    return [axon for _, axon in scheduled]
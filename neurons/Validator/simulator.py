@@ -0,0 +1,470 @@
+"""
+Local miner-fleet simulator for end-to-end Proof-of-GPU load testing.
+
+Runs the validator's real proof_of_gpu / test_miner_gpu code against N fake miners
+on one box: each miner answers Allocate through a local dendrite stand-in and serves
+the miner script agent protocol through an in-process transport that computes on
+CPU with a small n. Latency, transient failures and dishonest behaviour are
+configurable per fleet.
+
+Usage:
+    python -m neurons.Validator.simulator --miners 256 --latency 0.05 --failure-rate 0.05 --dishonest 0.1
+"""
+import argparse
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import os
+import random
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+import neurons.RSAEncryption as rsa
+from compute.utils.db import ComputeDb
+from neurons.Validator import miner_script_m_merkletree as miner_script
+from neurons.Validator.pog import get_random_seeds, load_yaml_config
+from neurons.Validator.transport import Transport
+from neurons.validator import Validator
+
+BEHAVIOURS = ("honest", "fake_compute", "small_n", "bad_proof", "slow", "busy", "crash")
+DISHONEST_BEHAVIOURS = ("fake_compute", "small_n", "bad_proof", "slow", "crash")
+
+
+class SimulatedMiner:
+    """
+    One fake miner: allocation state, agent protocol handlers and in-memory /dev/shm.
+
+    Behaviours:
+    - honest: computes C = A @ B and proves it correctly
+    - fake_compute: commits to a random matrix instead of the product
+    - small_n: reports the expected size_fp32 but computes and proves a 4x smaller product
+    - bad_proof: computes correctly but corrupts a Merkle sibling in every proof
+    - slow: sleeps past the validator's time tolerance during compute
+    - busy: refuses allocation
+    - crash: the agent dies in the middle of compute
+    """
+
+    def __init__(self, uid, gpu_name, num_gpus=1, behaviour="honest", latency=0.0, failure_rate=0.0, vram=0.02, time_tolerance=5, seed=None):
+        if behaviour not in BEHAVIOURS:
+            raise ValueError(f"Unknown behaviour: {behaviour}")
+        self.uid = uid
+        self.hotkey = f"sim-miner-{uid}"
+        self.ip = "127.0.0.1"
+        self.port = 8091 + uid
+        self.gpu_name = gpu_name
+        self.num_gpus = num_gpus
+        self.behaviour = behaviour
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.vram = vram
+        self.time_tolerance = time_tolerance
+        self.rng = random.Random(seed if seed is not None else uid)
+        self.public_key = None
+        self.files = {}
+        self.results = {}
+        self.allocations = 0
+
+    async def delay(self):
+        """Simulated network round trip: latency with +/-50% jitter."""
+        if self.latency:
+            await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+
+    def maybe_fail(self, what):
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise ConnectionResetError(f"{self.hotkey}: simulated {what} failure")
+
+    # Allocate synapse
+
+    async def allocate(self, synapse):
+        await self.delay()
+        self.maybe_fail("allocate")
+        if synapse.timeline == 0:
+            self.public_key = None
+            return {"status": True}
+        if self.behaviour == "busy" or self.public_key is not None:
+            return {"status": False}
+        if synapse.checking:
+            return {"status": True}
+        self.public_key = synapse.public_key
+        self.allocations += 1
+        info = json.dumps({"port": self.port, "username": "root", "password": "simulated"})
+        encrypted = rsa.encrypt_data(synapse.public_key.encode("utf-8"), info)
+        return {"status": True, "info": base64.b64encode(encrypted).decode("utf-8")}
+
+    # Miner script agent handlers
+
+    def gpu_info(self):
+        return {"num_gpus": self.num_gpus, "gpu_names": [self.gpu_name] * self.num_gpus}
+
+    def benchmark_compute(self, gpu_data, seeds, chunk_size=None, leaf_hashing="cpu", hash_algorithm="sha256"):
+        """CPU stand-in for benchmark_compute; reports the timings of the simulated GPU."""
+        hash_func = miner_script.get_hash_func(hash_algorithm)
+        size_fp16 = miner_script.adjust_matrix_size(self.vram, element_size=2, buffer_factor=1.0)
+        n, chunk_size = miner_script.proof_matrix_size(self.vram, chunk_size)
+        time_fp16 = 2 * size_fp16 ** 3 / (gpu_data["GPU_TFLOPS_FP16"][self.gpu_name] * 1e12)
+        time_fp32 = 2 * n ** 3 / (gpu_data["GPU_TFLOPS_FP32"][self.gpu_name] * 1e12)
+
+        size_fp32 = n
+        if self.behaviour == "small_n":
+            n = max(1, n // 4)
+
+        root_hashes, gpu_timings = [], []
+        for gpu_id in range(self.num_gpus):
+            s_A, s_B = seeds[gpu_id]
+            # Generation and hashing really run here, so report their measured times
+            start_time = time.time()
+            if self.behaviour == "fake_compute":
+                C = np.random.default_rng(s_A ^ s_B).random((n, n), dtype=np.float32)
+            else:
+                C = (miner_script.generate_matrix_torch(s_A, n) @ miner_script.generate_matrix_torch(s_B, n)).cpu().numpy()
+            generation_time = time.time() - start_time
+            start_time = time.time()
+            root_hash, tree = miner_script.build_merkle_tree_rows(C, hash_func, num_threads=1, chunk_size=chunk_size)
+            merkle_tree_time = time.time() - start_time
+            self.results[gpu_id] = (C, tree)
+            root_hashes.append((gpu_id, root_hash.hex()))
+            gpu_timings.append((gpu_id, {
+                "n": n, "generation_time": generation_time, "multiplication_time": time_fp32,
+                "transfer_back_time": 0.0, "merkle_tree_time": merkle_tree_time,
+            }))
+
+        benchmark_results = (self.num_gpus, self.vram, size_fp16, time_fp16, size_fp32, time_fp32)
+        return benchmark_results, root_hashes, gpu_timings
+
+    def proof(self, indices, chunk_size=None, hash_algorithm="sha256"):
+        hash_func = miner_script.get_hash_func(hash_algorithm)
+        for gpu_id, gpu_indices in indices.items():
+            C, tree = self.results[gpu_id]
+            n = C.shape[0]
+            size = chunk_size or n
+            num_chunks = (n + size - 1) // size
+            rows, proofs = [], []
+            for i, j in gpu_indices:
+                c = j // size
+                _, chunk_tree = miner_script.build_row_chunk_tree(C[i, :], size, hash_func)
+                rows.append(C[i, c * size:(c + 1) * size])
+                proof = miner_script.get_merkle_proof_row(chunk_tree, c, num_chunks) + miner_script.get_merkle_proof_row(tree, i, n)
+                if self.behaviour == "bad_proof" and proof:
+                    proof[-1] = bytes(b ^ 0xFF for b in proof[-1])
+                proofs.append(proof)
+            self.files[f"/dev/shm/responses_gpu_{gpu_id}.bin"] = miner_script.pack_responses(gpu_indices, rows, proofs)
+
+    async def handle(self, request, gpu_data):
+        await self.delay()
+        cmd = request["cmd"]
+        if cmd == "gpu_info":
+            return self.gpu_info()
+        if cmd == "benchmark_compute":
+            if self.behaviour == "crash":
+                raise EOFError("simulated agent crash")
+            if self.behaviour == "slow":
+                await asyncio.sleep(self.time_tolerance + 1)
+            seeds = {int(gpu_id): tuple(seeds) for gpu_id, seeds in request["seeds"].items()}
+            return await asyncio.to_thread(
+                self.benchmark_compute, gpu_data, seeds, request.get("chunk_size"),
+                request.get("leaf_hashing", "cpu"), request.get("hash_algorithm", "sha256"),
+            )
+        if cmd == "proof":
+            indices = {int(gpu_id): [tuple(idx) for idx in idx_list] for gpu_id, idx_list in request["indices"].items()}
+            return await asyncio.to_thread(self.proof, indices, request.get("chunk_size"), request.get("hash_algorithm", "sha256"))
+        raise ValueError(f"Unknown command: {cmd}")
+
+
+class _AgentStdin:
+    """Write side of the in-process agent; complete frames are queued for the agent task."""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.buffer = b""
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= 4:
+            (length,) = struct.unpack(">I", self.buffer[:4])
+            if len(self.buffer) < 4 + length:
+                break
+            self.queue.put_nowait(json.loads(self.buffer[4:4 + length]))
+            self.buffer = self.buffer[4 + length:]
+
+    async def drain(self):
+        pass
+
+    def write_eof(self):
+        self.queue.put_nowait(None)
+
+
+class SimulatedAgentProcess:
+    """In-process stand-in for the miner script running in agent mode."""
+
+    def __init__(self, miner, gpu_data):
+        self.miner = miner
+        self.gpu_data = gpu_data
+        self.requests = asyncio.Queue()
+        self.stdin = _AgentStdin(self.requests)
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.task = asyncio.create_task(self.serve())
+
+    async def serve(self):
+        try:
+            while True:
+                request = await self.requests.get()
+                if request is None or request.get("cmd") == "exit":
+                    break
+                try:
+                    result = await self.miner.handle(request, self.gpu_data)
+                    message = {"ok": True, "result": result}
+                except EOFError as e:
+                    self.stderr.feed_data(str(e).encode())
+                    break
+                except Exception as e:
+                    message = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                # Round-trip through JSON like the real pipe
+                payload = json.dumps(message).encode()
+                self.stdout.feed_data(struct.pack(">I", len(payload)) + payload)
+        finally:
+            self.stdout.feed_eof()
+            self.stderr.feed_eof()
+
+
+class SimulatedTransport(Transport):
+    """Transport stand-in that serves one simulated miner in process."""
+
+    def __init__(self, miner, gpu_data):
+        self.miner = miner
+        self.gpu_data = gpu_data
+        self.processes = []
+
+    async def connect(self):
+        await self.miner.delay()
+        self.miner.maybe_fail("ssh connect")
+
+    async def run(self, command):
+        await self.miner.delay()
+        # The only command the validator runs directly is the script hash check
+        return hashlib.sha256(self.miner.files.get("/tmp/miner_script.py", b"")).hexdigest(), ""
+
+    async def open_process(self, command):
+        await self.miner.delay()
+        process = SimulatedAgentProcess(self.miner, self.gpu_data)
+        self.processes.append(process)
+        return process
+
+    async def put(self, local_path, remote_path):
+        await self.miner.delay()
+        with open(local_path, "rb") as f:
+            self.miner.files[remote_path] = f.read()
+
+    async def read_file(self, remote_path, max_size=None):
+        await self.miner.delay()
+        data = self.miner.files[remote_path]
+        if max_size is not None and len(data) > max_size:
+            raise ValueError(f"{remote_path} is {len(data)} bytes, expected at most {max_size}")
+        return data
+
+    async def close(self):
+        for process in self.processes:
+            process.task.cancel()
+        await asyncio.gather(*(process.task for process in self.processes), return_exceptions=True)
+
+
+class SimulatedDendrite:
+    """Dendrite stand-in routing synapses to simulated miners by hotkey."""
+
+    def __init__(self, miners):
+        self.miners = miners
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def __call__(self, axon, synapse, timeout=12):
+        return await asyncio.wait_for(self.miners[axon.hotkey].allocate(synapse), timeout=timeout)
+
+
+class _NoAllocations:
+    """wandb stand-in: no miner is allocated to a validator."""
+
+    def get_allocated_hotkeys(self, valid_validator_hotkeys, flag):
+        return []
+
+
+class SimulatedValidator(Validator):
+    """
+    Validator running Proof-of-GPU against a simulated fleet.
+
+    Only the Proof-of-GPU state is set up, through Validator.init_pog; chain, wallet
+    and wandb access are replaced by the fleet. Every test_miner_gpu attempt is
+    recorded in self.attempts as (hotkey, seconds, passed).
+    """
+
+    def __init__(self, miners, config_data, db, verification_workers=2):
+        self.init_pog(config_data, verification_workers)
+        self.miners = {miner.hotkey: miner for miner in miners}
+        self.db = db
+        self.wandb = _NoAllocations()
+        self._queryable_uids = {miner.uid: miner for miner in miners}
+        self.uids = [miner.uid for miner in miners]
+        self.validator_challenge_batch_size = len(miners) or 1
+        self.attempts = []
+
+    def get_queryable(self):
+        return self._queryable_uids
+
+    def get_valid_validator_hotkeys(self):
+        return []
+
+    def get_dendrite(self):
+        return SimulatedDendrite(self.miners)
+
+    def create_transport(self, miner_info):
+        miner = next(m for m in self.miners.values() if m.port == miner_info["port"])
+        return SimulatedTransport(miner, self.config_data["gpu_performance"])
+
+    async def test_miner_gpu(self, axon, config_data):
+        start = time.monotonic()
+        passed = False
+        try:
+            result = await super().test_miner_gpu(axon, config_data)
+            passed = result[1] is not None and result[2] > 0
+            return result
+        finally:
+            self.attempts.append((axon.hotkey, time.monotonic() - start, passed))
+
+    def close(self):
+        self.verification_executor.shutdown()
+        rsa.stop_key_pool(wait=True)
+
+
+def build_fleet(num_miners, gpu_name="NVIDIA H100 80GB HBM3", num_gpus=1, latency=0.0, failure_rate=0.0, dishonest=0.0, busy=0.0, vram=0.02, time_tolerance=5, seed=0):
+    """
+    Create simulated miners; a dishonest fraction is spread over DISHONEST_BEHAVIOURS.
+
+    :return: List of SimulatedMiner.
+    """
+    rng = random.Random(seed)
+    miners = []
+    for uid in range(num_miners):
+        draw = rng.random()
+        if draw < dishonest:
+            behaviour = rng.choice(DISHONEST_BEHAVIOURS)
+        elif draw < dishonest + busy:
+            behaviour = "busy"
+        else:
+            behaviour = "honest"
+        miners.append(SimulatedMiner(
+            uid, gpu_name, num_gpus, behaviour, latency, failure_rate, vram, time_tolerance, seed=rng.randrange(2**32),
+        ))
+    return miners
+
+
+def simulation_config(config_data, retry_limit=3, retry_interval=0.1, max_workers=64, deadline=600):
+    """Copy of config.yaml settings with the random start delay removed and short retries."""
+    config_data = copy.deepcopy(config_data)
+    merkle_proof = config_data["merkle_proof"]
+    merkle_proof["max_random_delay"] = 0
+    merkle_proof["pog_retry_limit"] = retry_limit
+    merkle_proof["pog_retry_interval"] = retry_interval
+    merkle_proof["pog_retry_max_interval"] = retry_interval * 8
+    merkle_proof["pog_deadline"] = deadline
+    merkle_proof["max_workers"] = max_workers
+    return config_data
+
+
+def summarize(validator, wall_time):
+    """Throughput, tail latency and outcome counts of a simulated run."""
+    latencies = np.array([seconds for _, seconds, _ in validator.attempts]) if validator.attempts else np.zeros(1)
+    attempts_per_miner = {}
+    for hotkey, _, _ in validator.attempts:
+        attempts_per_miner[hotkey] = attempts_per_miner.get(hotkey, 0) + 1
+
+    outcomes = {}
+    for miner in validator.miners.values():
+        outcome = outcomes.setdefault(miner.behaviour, {"miners": 0, "verified": 0})
+        outcome["miners"] += 1
+        outcome["verified"] += miner.hotkey in validator.results
+
+    return {
+        "miners": len(validator.miners),
+        "wall_time": wall_time,
+        "attempts": len(validator.attempts),
+        "throughput": len(validator.attempts) / wall_time if wall_time else 0.0,
+        "latency_p50": float(np.percentile(latencies, 50)),
+        "latency_p95": float(np.percentile(latencies, 95)),
+        "latency_p99": float(np.percentile(latencies, 99)),
+        "latency_max": float(latencies.max()),
+        "max_attempts_per_miner": max(attempts_per_miner.values(), default=0),
+        "outcomes": outcomes,
+    }
+
+
+async def run_simulation(miners, config_data, db_path=None, verification_workers=2):
+    """
+    Run one proof_of_gpu round of the validator against the simulated miners.
+
+    :return: Summary dict (see summarize).
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="pog-sim-"), "database.db")
+    previous_db_path = os.environ.get("SQLITE_DB_PATH")
+    os.environ["SQLITE_DB_PATH"] = db_path
+    try:
+        db = ComputeDb()
+    finally:
+        if previous_db_path is None:
+            os.environ.pop("SQLITE_DB_PATH", None)
+        else:
+            os.environ["SQLITE_DB_PATH"] = previous_db_path
+
+    validator = SimulatedValidator(miners, config_data, db, verification_workers)
+    try:
+        # Spawn the verification workers and import pog in them before timing starts
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(validator.verification_executor, get_random_seeds, 0)
+            for _ in range(verification_workers)
+        ))
+        start = time.monotonic()
+        await validator.proof_of_gpu()
+        return summarize(validator, time.monotonic() - start)
+    finally:
+        validator.close()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a miner fleet against the validator's Proof-of-GPU.")
+    parser.add_argument("--config", default="config.yaml", help="Validator config.yaml")
+    parser.add_argument("--miners", type=int, default=256)
+    parser.add_argument("--gpu", default="NVIDIA H100 80GB HBM3", help="GPU every simulated miner claims and mimics")
+    parser.add_argument("--num-gpus", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean seconds per simulated round trip")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability of a transient failure per connect/allocate")
+    parser.add_argument("--dishonest", type=float, default=0.0, help="Fraction of dishonest miners")
+    parser.add_argument("--busy", type=float, default=0.0, help="Fraction of miners refusing allocation")
+    parser.add_argument("--vram", type=float, default=0.02, help="Reported VRAM in GB; sets the simulated n")
+    parser.add_argument("--workers", type=int, default=64, help="merkle_proof.max_workers")
+    parser.add_argument("--retry-limit", type=int, default=3)
+    parser.add_argument("--retry-interval", type=float, default=0.1)
+    parser.add_argument("--deadline", type=float, default=600, help="merkle_proof.pog_deadline")
+    parser.add_argument("--verification-workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config_data = simulation_config(load_yaml_config(args.config), args.retry_limit, args.retry_interval, args.workers, args.deadline)
+    miners = build_fleet(
+        args.miners, args.gpu, args.num_gpus, args.latency, args.failure_rate, args.dishonest, args.busy,
+        args.vram, config_data["merkle_proof"].get("time_tolerance", 5), args.seed,
+    )
+    summary = asyncio.run(run_simulation(miners, config_data, verification_workers=args.verification_workers))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import abc
+import asyncio
+
+import asyncssh
+
+
+class Transport(abc.ABC):
+    """
+    Connection to a miner used by the Proof-of-GPU pipeline.
+
+    Implementations are fully asynchronous so many miners can be tested
+    concurrently from a single event loop.
+    """
+
+    @abc.abstractmethod
+    async def connect(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def run(self, command):
+        """
+        Run a command to completion.
+
+        :param command: Shell command to run on the miner.
+        :return: Tuple of (stdout, stderr) as stripped strings.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def open_process(self, command):
+        """
+        Start a long-running command.
+
+        :param command: Shell command to run on the miner.
+        :return: Process exposing binary stdin (write/drain/write_eof), stdout and stderr (readexactly/read) streams.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def put(self, local_path, remote_path):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def read_file(self, remote_path, max_size=None):
+        """
+        Read a remote file straight into memory.
+
+        :param remote_path: Path of the file on the miner.
+        :param max_size: Largest accepted file size in bytes; larger files are not read.
+        :return: File content as bytes.
+        :raises ValueError: If the file is larger than max_size.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def close(self):
+        raise NotImplementedError
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class AsyncSSHTransport(Transport):
+    """SSH transport built on asyncssh, with one connection and one SFTP session per miner."""
+
+    def __init__(self, host, port=22, username=None, password=None, connect_timeout=10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.connect_timeout = connect_timeout
+        self._conn = None
+        self._sftp = None
+        self._sftp_lock = asyncio.Lock()
+
+    async def connect(self):
+        self._conn = await asyncssh.connect(
+            self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            known_hosts=None,
+            connect_timeout=self.connect_timeout,
+        )
+
+    async def run(self, command):
+        result = await self._conn.run(command)
+        return (result.stdout or "").strip(), (result.stderr or "").strip()
+
+    async def open_process(self, command):
+        return await self._conn.create_process(command, encoding=None)
+
+    async def _get_sftp(self):
+        # Concurrent transfers share a single SFTP session
+        async with self._sftp_lock:
+            if self._sftp is None:
+                self._sftp = await self._conn.start_sftp_client()
+        return self._sftp
+
+    async def put(self, local_path, remote_path):
+        sftp = await self._get_sftp()
+        await sftp.put(local_path, remote_path)
+
+    async def read_file(self, remote_path, max_size=None):
+        sftp = await self._get_sftp()
+        if max_size is not None:
+            attrs = await sftp.stat(remote_path)
+            if attrs.size is not None and attrs.size > max_size:
+                raise ValueError(f"{remote_path} is {attrs.size} bytes, expected at most {max_size}")
+        async with sftp.open(remote_path, "rb") as f:
+            if max_size is None:
+                return await f.read()
+            # The miner may still grow the file after the stat; never read past the bound
+            data = await f.read(max_size + 1)
+        if len(data) > max_size:
+            raise ValueError(f"{remote_path} is larger than {max_size} bytes")
+        return data
+
+    async def close(self):
+        if self._sftp is not None:
+            self._sftp.exit()
+            self._sftp = None
+        if self._conn is not None:
+            self._conn.close()
+            await self._conn.wait_closed()
+            self._conn = None
@@ -23,6 +23,7 @@ class MinerChecker:
         self.wandb = ComputeWandb(config, bt.wallet(config=config), "validator.py") # Added ComputeWandb integration
         self.penalized_hotkeys_checklist = [] # List of dictionaries for penalized miners
         self.allocated_hotkeys = []  # Allocated miners that shouldn't be checked
+        rsa.start_key_pool(size=self.validator_challenge_batch_size)  # One key pair per checked miner
 
     def get_metagraph(self):
         """Retrieves the metagraph from subtensor."""
@@ -90,7 +91,7 @@ class MinerChecker:
 
         is_ssh_access = True
         allocation_status = False
-        private_key, public_key = rsa.generate_key_pair()
+        private_key, public_key = rsa.get_key_pair()
 
         device_requirement = {"cpu": {"count": 1}, "gpu": {}, "hard_disk": {"capacity": 1073741824}, "ram": {"capacity": 1073741824}, "testing": True}
 
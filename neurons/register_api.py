@@ -339,6 +339,8 @@ class RegisterAPI:
         configured_max_workers = 32
         safe_max_workers = min((cpu_cores + 4)*4, configured_max_workers)
         self.executor = ThreadPoolExecutor(max_workers=safe_max_workers)
+        # Keep RSA key pairs pre-generated so allocation requests do not pay for key generation
+        rsa.start_key_pool(size=8)
 
 
     def _setup_routes(self):
@@ -373,7 +375,7 @@ class RegisterAPI:
             """
             This function is called when the appRemove unnecessary blank line in notify_url assignmentlication stops. <br>
             """
-            pass
+            ComputeDb.close_connections()
 
         # Entry point for the API
         @self.app.get("/", tags=["Root"])
@@ -456,7 +458,7 @@ class RegisterAPI:
                 uuid_key = str(uuid.uuid1())
 
                 timeline = int(requirements.timeline)
-                private_key, public_key = rsa.generate_key_pair()
+                private_key, public_key = rsa.get_key_pair()
                 run_start = time.time()
                 result = await self._allocate_container( device_requirement,
                                                  timeline, public_key, docker_requirement.model_dump())
@@ -602,7 +604,7 @@ class RegisterAPI:
                 # Generate UUID
                 uuid_key = str(uuid.uuid1())
 
-                private_key, public_key = rsa.generate_key_pair()
+                private_key, public_key = rsa.get_key_pair()
 
                 if docker_requirement is None:
                     docker_requirement = DockerRequirement()
@@ -3164,30 +3166,18 @@ class RegisterAPI:
     def miner_pog_ok(self, db: ComputeDb, hours: int, ss58_address: str) -> bool:
         try:
             cursor = db.get_cursor()
+            # Oldest entry from the (hotkey, created_at) index; a verified spec exists iff pog_latest has a row
             cursor.execute(
                 """
-                SELECT MIN(created_at)
-                FROM pog_stats
-                WHERE hotkey = ?
+                SELECT
+                    (SELECT MIN(created_at) FROM pog_stats WHERE hotkey = ?),
+                    EXISTS (SELECT 1 FROM pog_latest WHERE hotkey = ?)
                 """,
-                (ss58_address,)
+                (ss58_address, ss58_address)
             )
 
-            oldest_timestamp = cursor.fetchone()[0]
-
-            cursor.execute(
-                """
-                SELECT COUNT(*)
-                FROM pog_stats
-                WHERE hotkey = ?
-                AND gpu_name IS NOT NULL
-                AND num_gpus IS NOT NULL
-                """,
-                (ss58_address,)
-            )
-
-            non_null_count = cursor.fetchone()[0]
-            if oldest_timestamp and non_null_count > 0:
+            oldest_timestamp, has_verified_spec = cursor.fetchone()
+            if oldest_timestamp and has_verified_spec:
                 if (datetime.now() - datetime.fromisoformat(oldest_timestamp)).total_seconds() <= hours * 3600:
                     bt.logging.info(f"Hotkey not old enough: {ss58_address}")
                     return False
@@ -34,17 +34,16 @@ from typing import Dict, Tuple, List
 import bittensor as bt
 import math
 import time
-import paramiko
 
 import cryptography
 import torch
 from cryptography.fernet import Fernet
 from torch._C._te import Tensor # type: ignore
-import RSAEncryption as rsa
+import neurons.RSAEncryption as rsa
 import concurrent.futures
 from collections import defaultdict
 
-import Validator.app_generator as ag
+import neurons.Validator.app_generator as ag
 from compute import (
     SUSPECTED_EXPLOITERS_HOTKEYS,
     SUSPECTED_EXPLOITERS_COLDKEYS,
@@ -55,17 +54,21 @@ from compute import (
 from compute.axon import ComputeSubnetSubtensor
 from compute.protocol import Allocate, Challenge, Specs
 from compute.utils.db import ComputeDb
+from compute.utils.executor import spawn_process_pool
 from compute.utils.math import percent, force_to_float_or_default
 from compute.utils.parser import ComputeArgPaser
 from compute.utils.subtensor import is_registered, get_current_block, calculate_next_block_time
 from compute.utils.version import try_update, get_local_version, version2number, get_remote_version
 from compute.wandb.wandb import ComputeWandb
-from neurons.Validator.calculate_pow_score import calc_score_pog
+from neurons.Validator.calculate_pow_score import build_gpu_score_lookup, calc_scores_pog
+from neurons.Validator.concurrency import AIMDLimiter, backoff_delay
 from neurons.Validator.database.allocate import update_miner_details, select_has_docker_miners_hotkey, get_miner_details
 from neurons.Validator.database.challenge import select_challenge_stats, update_challenge_details
 from neurons.Validator.database.miner import select_miners, purge_miner_entries, update_miners
-from neurons.Validator.pog import adjust_matrix_size, compute_script_hash, execute_script_on_miner, get_random_seeds, load_yaml_config, parse_merkle_output, receive_responses, send_challenge_indices, send_script_and_request_hash, parse_benchmark_output, identify_gpu, send_seeds, verify_merkle_proof_row, get_remote_gpu_info, verify_responses
-from neurons.Validator.database.pog import get_pog_specs, retrieve_stats, update_pog_stats, write_stats
+from neurons.Validator.pog import adjust_matrix_size, check_timing, compute_script_hash, get_random_indices, get_random_seeds, load_yaml_config, proof_matrix_size, receive_responses, response_size, send_script_and_request_hash, identify_gpu, verify_responses, MinerScriptSession
+from neurons.Validator.database.pog import get_latest_pog_specs, get_pog_history, purge_pog_stats, retrieve_stats, trim_pog_stats, update_pog_stats, write_stats
+from neurons.Validator.scheduler import schedule_pog_targets
+from neurons.Validator.transport import AsyncSSHTransport
 
 class Validator:
     blocks_done: set = set()
@@ -79,6 +82,9 @@ class Validator:
     queryable_for_specs: dict = {}
     finalized_specs_once: bool = False
 
+    # Concurrency limiter of the running Proof-of-GPU round
+    pog_limiter: AIMDLimiter = None
+
     total_current_miners: int = 0
 
     scores: Tensor
@@ -177,13 +183,7 @@ class Validator:
         # STEP 2B: Init Proof of GPU
         # Load configuration from YAML
         config_file = "config.yaml"
-        self.config_data = load_yaml_config(config_file)
-        cpu_cores = os.cpu_count() or 1
-        configured_max_workers = self.config_data["merkle_proof"].get("max_workers", 32)
-        safe_max_workers = min((cpu_cores + 4)*4, configured_max_workers)
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=safe_max_workers)
-        self.results = {}
-        self.gpu_task = None  # Track the GPU task
+        self.init_pog(load_yaml_config(config_file))
 
         # Step 3: Set up initial scoring weights for validation
         bt.logging.info("Building validation weights.")
@@ -262,6 +262,27 @@ class Validator:
         self._metagraph = self.subtensor.metagraph(self.config.netuid)
         self.uids = self.metagraph.uids.tolist()
 
+    def init_pog(self, config_data, verification_workers=None):
+        """
+        Set up the state proof_of_gpu and test_miner_gpu rely on.
+
+        :param config_data: Parsed config.yaml.
+        :param verification_workers: Size of the verification process pool (default:
+            merkle_proof.verification_workers, or up to 4 processes).
+        """
+        self.config_data = config_data
+        self.gpu_score_lookup = build_gpu_score_lookup(self.config_data)
+        if verification_workers is None:
+            # Every worker imports pog (torch, bittensor), so keep the idle footprint small
+            cpu_cores = os.cpu_count() or 1
+            verification_workers = self.config_data["merkle_proof"].get("verification_workers", min(cpu_cores, 4))
+        # CPU-heavy proof verification runs in its own processes so it does not serialise on the GIL
+        self.verification_executor = spawn_process_pool(verification_workers)
+        # Every miner test needs a fresh RSA key pair; keep them pre-generated off the event loop
+        rsa.start_key_pool(size=self.config_data["merkle_proof"].get("max_workers", 32))
+        self.results = {}
+        self.gpu_task = None  # Track the GPU task
+
     def init_scores(self):
         self.scores = torch.zeros(len(self.uids), dtype=torch.float32)
         # Set the weights of validators to zero.
@@ -323,6 +344,13 @@ class Validator:
         self.penalized_hotkeys = self.wandb.get_penalized_hotkeys_checklist_bak(valid_validator_hotkeys, True)
         self._queryable_uids = self.get_queryable()
 
+        # Latest verified GPU specs of every miner in a single query
+        pog_specs = get_latest_pog_specs(self.db)
+        # Deregistered or unreachable miners whose PoG stats are removed in one batch
+        purged_hotkeys = []
+        # Miners scored from our own PoG results, computed together after the loop
+        own_uids, own_specs = [], []
+
         # Calculate score
         for uid in self.uids:
             try:
@@ -339,11 +367,7 @@ class Validator:
                     self.scores[uid] = 0
 
                     # Remove entry from PoG stats
-                    cursor = self.db.get_cursor()
-                    cursor.execute(
-                        "DELETE FROM pog_stats WHERE hotkey = ?",
-                        (hotkey,),
-                    )
+                    purged_hotkeys.append(hotkey)
                     continue  # Skip further processing for this uid
 
                 axon = self._queryable_uids[uid]
@@ -358,11 +382,12 @@ class Validator:
                 self.stats[uid]["allocated"] = hotkey in self.allocated_hotkeys
 
                 # Check GPU specs in our PoG DB
-                gpu_specs = get_pog_specs(self.db, hotkey)
+                gpu_specs = pog_specs.get(hotkey)
+                own_score = gpu_specs is not None and hotkey not in self.penalized_hotkeys
 
                 # If found in our local database
                 if gpu_specs is not None:
-                    score = calc_score_pog(gpu_specs, hotkey, self.allocated_hotkeys, self.config_data)
+                    score = 0  # Filled in from the batched scores below
                     self.stats[uid]["own_score"] = True  # or "yes" if you prefer a string
                 else:
                     # If not found locally, try fallback from stats_allocated
@@ -389,6 +414,10 @@ class Validator:
                 if "reliability_score" not in self.stats[uid]:
                     self.stats[uid]["reliability_score"] = 0.0
 
+                if own_score:
+                    own_uids.append(uid)
+                    own_specs.append(gpu_specs)
+
             except KeyError as e:
                 bt.logging.trace(f"KeyError occurred for UID {uid}: {str(e)}")
                 score = 0
@@ -399,6 +428,15 @@ class Validator:
             # Keep a simple reference of scores
             self.scores[uid] = score
 
+        # Score every miner with local PoG specs as one tensor
+        if own_uids:
+            own_scores = calc_scores_pog(own_specs, self.gpu_score_lookup)
+            self.scores[own_uids] = own_scores
+            for uid, score in zip(own_uids, own_scores.tolist()):
+                self.stats[uid]["score"] = score*100
+
+        purge_pog_stats(self.db, purged_hotkeys)
+
         write_stats(self.db, self.stats)
 
         self.update_allocation_wandb()
@@ -644,7 +682,7 @@ class Validator:
                         await self.deallocate_miner(axon, None)
 
         # Update the local db with the new data from Wandb
-        update_miner_details(self.db, list(specs_dict.keys()), list(specs_dict.values()))
+        update_miner_details(self.db, list(specs_dict.values()))
 
         # Log the hotkey and specs
         # bt.logging.info(f"✅ GPU specs per hotkey (Wandb):")
@@ -663,7 +701,10 @@ class Validator:
     async def proof_of_gpu(self):
         """
         Perform Proof-of-GPU benchmarking on allocated miners without overlapping tests.
-        Uses asyncio with ThreadPoolExecutor to test miners in parallel.
+        Uses asyncio worker tasks over an async SSH transport to test miners in parallel.
+        The number of concurrent tests follows an AIMD limiter driven by allocation and
+        SSH connect latency and errors; failed miners are retried with exponential
+        backoff and jitter until the round's deadline.
         """
         try:
             # Init miners to be tested
@@ -675,9 +716,21 @@ class Validator:
             merkle_proof = self.config_data["merkle_proof"]
             retry_limit = merkle_proof.get("pog_retry_limit",30)
             retry_interval = merkle_proof.get("pog_retry_interval",75)
+            retry_max_interval = merkle_proof.get("pog_retry_max_interval",600)
             num_workers = merkle_proof.get("max_workers",32)
+            initial_workers = merkle_proof.get("pog_initial_workers",16)
+            latency_target = merkle_proof.get("pog_latency_target",20)
+            deadline = merkle_proof.get("pog_deadline",3600)
+            retest_interval = merkle_proof.get("pog_retest_interval",4320)
+            max_retest_stretch = merkle_proof.get("pog_max_retest_stretch",4)
+            stats_retention = merkle_proof.get("pog_stats_retention",4)
             max_delay = merkle_proof.get("max_random_delay",1200)
 
+            # The deadline counts from the scheduled start so that the random delay does not
+            # push the round into the next one
+            round_start = time.monotonic()
+            deadline = min(deadline, retest_interval)
+
             # Random delay for PoG
             delay = random.uniform(0, max_delay)  # Random delay
             bt.logging.info(f"💻⏳ Scheduled Proof-of-GPU task to start in {delay:.2f} seconds.")
@@ -691,7 +744,8 @@ class Validator:
             # Queue of miners to process
             queue = asyncio.Queue()
 
-            # Initialize the queue with initial miners
+            # Collect the miners that can be tested
+            candidates = []
             for i in range(0, len(self.uids), self.validator_challenge_batch_size):
                 for _uid in self.uids[i : i + self.validator_challenge_batch_size]:
                     try:
@@ -699,38 +753,64 @@ class Validator:
                         if axon.hotkey in self.allocated_hotkeys:
                             bt.logging.info(f"Skipping allocated miner: {axon.hotkey}")
                             continue  # skip this miner since it's allocated
-                        await queue.put(axon)
+                        candidates.append(axon)
                     except KeyError:
                         continue
 
+            # Initialize the queue by priority: new, failed, then stale and high-value miners;
+            # miners with repeated identical results are re-tested less often
+            history = get_pog_history(self.db)
+            gpu_scores = self.config_data["gpu_performance"].get("gpu_scores", {})
+            targets = schedule_pog_targets(candidates, history, gpu_scores, retest_interval, max_retest_stretch)
+            bt.logging.info(f"💻 Proof-of-GPU round: {len(targets)} miners due, {len(candidates) - len(targets)} stable miners deferred.")
+            for axon in targets:
+                await queue.put(axon)
+
             # Initialize a single Lock for thread-safe updates to results
             results_lock = asyncio.Lock()
 
+            # Determine a safe upper bound on the number of concurrent tests
+            cpu_cores = os.cpu_count() or 1
+            safe_max_workers = min((cpu_cores + 4)*4, num_workers)
+            limiter = AIMDLimiter(initial_workers, max_limit=safe_max_workers, latency_target=latency_target)
+            self.pog_limiter = limiter
+            # Retries waiting for their backoff delay to expire
+            pending_retries = set()
+
+            async def requeue_later(axon, delay):
+                await asyncio.sleep(delay)
+                # Put before task_done so queue.join() does not see the miner as finished
+                queue.put_nowait(axon)
+                queue.task_done()
+
+            def retry_or_fail(hotkey, axon, reason):
+                retry_counts[hotkey] += 1
+                if retry_counts[hotkey] < retry_limit:
+                    retry_delay = backoff_delay(retry_counts[hotkey], retry_interval, retry_max_interval)
+                    bt.logging.info(f"🔄 {hotkey}: Retrying miner in {retry_delay:.0f}s -> (Attempt {retry_counts[hotkey]})")
+                    task = asyncio.create_task(requeue_later(axon, retry_delay))
+                    pending_retries.add(task)
+                    task.add_done_callback(pending_retries.discard)
+                    return True
+                bt.logging.info(f"❌ {hotkey}: Miner failed after {retry_limit} attempts{reason}.")
+                update_pog_stats(self.db, hotkey, None, None)
+                return False
+
             async def worker():
                 while True:
+                    await limiter.acquire()
                     try:
                         axon = await queue.get()
                     except asyncio.CancelledError:
+                        limiter.release()
                         break
                     hotkey = axon.hotkey
+                    retrying = False
                     try:
                         # Set a timeout for the GPU test
                         timeout = 300  # e.g., 5 minutes
-                        # Define a synchronous helper function to run the asynchronous test_miner_gpu
-                        # This is required because run_in_executor expects a synchronous callable.
-                        def run_test_miner_gpu():
-                            # Run the async test_miner_gpu function and wait for its result.
-                            future = asyncio.run_coroutine_threadsafe(self.test_miner_gpu(axon, self.config_data), self.loop)
-                            return future.result()
-
-                        # Submit the run_test_miner_gpu function to a thread pool executor.
-                        # The asyncio.wait_for is used to enforce a timeout for the overall operation.
-                        result = await asyncio.wait_for(
-                            asyncio.get_running_loop().run_in_executor(
-                                self.executor, run_test_miner_gpu
-                            ),
-                            timeout=timeout
-                        )
+                        # The test runs natively on the event loop; the timeout cancels it cleanly
+                        result = await asyncio.wait_for(self.test_miner_gpu(axon, self.config_data), timeout=timeout)
                         if result[1] is not None and result[2] > 0:
                             async with results_lock:
                                 self.results[hotkey] = {
@@ -742,43 +822,35 @@ class Validator:
                             raise RuntimeError("GPU test failed")
                     except asyncio.TimeoutError:
                         bt.logging.warning(f"⏳ Timeout while testing {hotkey}. Retrying...")
-                        retry_counts[hotkey] += 1
-                        if retry_counts[hotkey] < retry_limit:
-                            bt.logging.info(f"🔄 {hotkey}: Retrying miner -> (Attempt {retry_counts[hotkey]})")
-                            await asyncio.sleep(retry_interval)
-                            await queue.put(axon)
-                        else:
-                            bt.logging.info(f"❌ {hotkey}: Miner failed after {retry_limit} attempts (Timeout).")
-                            update_pog_stats(self.db, hotkey, None, None)
+                        retrying = retry_or_fail(hotkey, axon, " (Timeout)")
                     except Exception as e:
                         bt.logging.trace(f"Exception in worker for {hotkey}: {e}")
-                        retry_counts[hotkey] += 1
-                        if retry_counts[hotkey] < retry_limit:
-                            bt.logging.info(f"🔄 {hotkey}: Retrying miner -> (Attempt {retry_counts[hotkey]})")
-                            await asyncio.sleep(retry_interval)
-                            await queue.put(axon)
-                        else:
-                            bt.logging.info(f"❌ {hotkey}: Miner failed after {retry_limit} attempts.")
-                            update_pog_stats(self.db, hotkey, None, None)
+                        retrying = retry_or_fail(hotkey, axon, "")
                     finally:
-                        queue.task_done()
-
-            # Number of concurrent workers
-            # Determine a safe default number of workers
-            cpu_cores = os.cpu_count() or 1
-            safe_max_workers = min((cpu_cores + 4)*4, num_workers)
+                        limiter.release()
+                        # A scheduled retry marks the item done once it is back in the queue
+                        if not retrying:
+                            queue.task_done()
 
             workers = [asyncio.create_task(worker()) for _ in range(safe_max_workers)]
-            bt.logging.trace(f"Started {safe_max_workers} worker tasks for Proof-of-GPU benchmarking.")
+            bt.logging.trace(f"Started {safe_max_workers} worker tasks for Proof-of-GPU benchmarking (initial concurrency {limiter.limit:.0f}).")
 
-            # Wait until the queue is fully processed
-            await queue.join()
+            # Wait until the queue is fully processed or the round runs out of time
+            try:
+                await asyncio.wait_for(queue.join(), timeout=max(0.0, deadline - (time.monotonic() - round_start)))
+            except asyncio.TimeoutError:
+                bt.logging.warning(f"⏳ Proof-of-GPU deadline of {deadline}s reached; {len(pending_retries)} miners waiting for a retry, {queue.qsize()} not tested.")
 
-            # Cancel worker tasks
-            for w in workers:
-                w.cancel()
+            # Cancel worker tasks and pending retries
+            for task in [*workers, *pending_retries]:
+                task.cancel()
             # Wait until all worker tasks are cancelled
             await asyncio.gather(*workers, return_exceptions=True)
+            self.pog_limiter = None
+
+            # Retention: keep the newest pog_stats entries of every miner
+            trimmed = trim_pog_stats(self.db, stats_retention)
+            bt.logging.trace(f"Removed {trimmed} old pog_stats entries.")
 
             bt.logging.success(f"✅ Proof-of-GPU benchmarking completed.")
             return self.results
@@ -804,7 +876,10 @@ class Validator:
         """
         allocation_status = False
         miner_info = None
+        setup_start = None
         host = None  # Initialize host variable
+        transport = None
+        session = None
         hotkey = axon.hotkey
         bt.logging.trace(f"{hotkey}: Starting miner test.")
 
@@ -814,16 +889,23 @@ class Validator:
             gpu_tolerance_pairs = gpu_data.get("gpu_tolerance_pairs", {})
             # Extract Merkle Proof Settings
             merkle_proof = config_data["merkle_proof"]
-            time_tol = merkle_proof.get("time_tolerance",5)
+            num_indices = merkle_proof.get("num_indices",32)
+            proof_mode = merkle_proof.get("proof_mode","row")
+            submatrix_size = merkle_proof.get("submatrix_size",512)
+            leaf_hashing = merkle_proof.get("leaf_hashing","cpu")
+            hash_algorithm = merkle_proof.get("hash_algorithm","sha256")
             # Extract miner_script path
             miner_script_path = merkle_proof["miner_script_path"]
 
             # Step 1: Allocate Miner
             # Generate RSA key pair
-            private_key, public_key = rsa.generate_key_pair()
+            private_key, public_key = rsa.get_key_pair()
+            # Allocation and SSH connect latency feed the Proof-of-GPU concurrency limiter
+            setup_start = time.monotonic()
             allocation_response = await self.allocate_miner(axon, private_key, public_key)
             if not allocation_response:
                 bt.logging.info(f"🌀 {hotkey}: Busy or not allocatable.")
+                self.record_pog_setup(setup_start)
                 return (hotkey, None, 0)
             allocation_status = True
             miner_info = allocation_response
@@ -831,28 +913,28 @@ class Validator:
             bt.logging.trace(f"{hotkey}: Allocated Miner for testing.")
 
             # Step 2: Connect via SSH
-            ssh_client = paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            transport = self.create_transport(miner_info)
             bt.logging.trace(f"{hotkey}: Connect to Miner via SSH.")
-            ssh_client.connect(host, port=miner_info.get('port', 22), username=miner_info['username'], password=miner_info['password'], timeout=10)
-            if not (ssh_client):
-                ssh_client.close()
-                bt.logging.info(f"{hotkey}: SSH connection failed.")
-                return (hotkey, None, -1)
+            await transport.connect()
+            self.record_pog_setup(setup_start)
+            setup_start = None
             bt.logging.trace(f"{hotkey}: Connected to Miner via SSH.")
 
             # Step 3: Hash Check
             local_hash = compute_script_hash(miner_script_path)
             bt.logging.trace(f"{hotkey}: [Step 1] Local script hash computed successfully.")
             bt.logging.trace(f"{hotkey}: Local Hash: {local_hash}")
-            remote_hash = send_script_and_request_hash(ssh_client, miner_script_path)
+            remote_hash = await send_script_and_request_hash(transport, miner_script_path)
             if local_hash != remote_hash:
                 bt.logging.info(f"{hotkey}: [Integrity Check] FAILURE: Hash mismatch detected.")
                 raise ValueError(f"{hotkey}: Script integrity verification failed.")
 
+            # Start the miner script once; every following step is a request on the same channel
+            session = await MinerScriptSession.start(transport)
+
             # Step 4: Get GPU info NVIDIA from the remote miner
             bt.logging.trace(f"{hotkey}: [Step 4] Retrieving GPU information (NVIDIA driver) from miner...")
-            gpu_info = get_remote_gpu_info(ssh_client)
+            gpu_info = await session.request("gpu_info")
             num_gpus_reported = gpu_info["num_gpus"]
             gpu_name_reported = gpu_info["gpu_names"][0] if num_gpus_reported > 0 else None
             bt.logging.trace(f"{hotkey}: [Step 4] Reported GPU Information:")
@@ -863,13 +945,21 @@ class Validator:
                 bt.logging.info(f"{hotkey}: No GPUs detected.")
                 raise ValueError("No GPUs detected.")
 
-            # Step 5: Run the benchmarking mode
+            # Step 5: Run the benchmarking and Merkle proof compute modes in one request;
+            # the seeded fp32 matmul doubles as the fp32 timing sample
             bt.logging.info(f"💻 {hotkey}: Executing benchmarking mode.")
-            bt.logging.trace(f"{hotkey}: [Step 5] Executing benchmarking mode on the miner...")
-            execution_output = execute_script_on_miner(ssh_client, mode='benchmark')
+            bt.logging.trace(f"{hotkey}: [Step 5] Executing benchmarking and compute mode on the miner...")
+            seeds = get_random_seeds(num_gpus_reported)
+            chunk_size = submatrix_size if proof_mode == "chunk" else None
+            start_time = time.time()
+            benchmark_results, root_hashes_list, gpu_timings_list = await session.request(
+                "benchmark_compute", seeds=seeds, chunk_size=chunk_size, leaf_hashing=leaf_hashing,
+                hash_algorithm=hash_algorithm,
+            )
+            end_time = time.time()
+            elapsed_time = end_time - start_time
+            num_gpus, vram, size_fp16, time_fp16, size_fp32, time_fp32 = benchmark_results
             bt.logging.trace(f"{hotkey}: [Step 5] Benchmarking completed.")
-            # Parse the execution output
-            num_gpus, vram, size_fp16, time_fp16, size_fp32, time_fp32 = parse_benchmark_output(execution_output)
             bt.logging.trace(f"{hotkey}: [Benchmark Results] Detected {num_gpus} GPU(s) with {vram} GB unfractured VRAM.")
             bt.logging.trace(f"{hotkey}: FP16 - Matrix Size: {size_fp16}, Execution Time: {time_fp16} s")
             bt.logging.trace(f"{hotkey}: FP32 - Matrix Size: {size_fp32}, Execution Time: {time_fp32} s")
@@ -882,20 +972,20 @@ class Validator:
             gpu_name = identify_gpu(fp16_tflops, fp32_tflops, vram, gpu_data, gpu_name_reported, gpu_tolerance_pairs)
             bt.logging.trace(f"{hotkey}: [GPU Identification] Based on performance: {gpu_name}")
 
-            # Step 6: Run the Merkle proof mode
+            # Step 6: Check the Merkle proof commitment
             bt.logging.trace(f"{hotkey}: [Step 6] Initiating Merkle Proof Mode.")
-            # Step 1: Send seeds and execute compute mode
-            n = adjust_matrix_size(vram, element_size=4, buffer_factor=0.10)
-            seeds = get_random_seeds(num_gpus)
-            send_seeds(ssh_client, seeds, n)
+            # The miner sizes the seeded matrices from its VRAM probe; hold it to the same rule
+            n, chunk_size = proof_matrix_size(vram, chunk_size)
+            if size_fp32 != n:
+                bt.logging.info(f"{hotkey}: Compute matrix size {size_fp32} does not match expected {n}.")
+                raise ValueError(f"{hotkey}: Unexpected compute matrix size.")
+            # Every GPU must have committed to an n x n product; never trust a per-GPU n
+            for gpu_id, timing in gpu_timings_list:
+                if timing.get('n') != n:
+                    bt.logging.info(f"{hotkey}: GPU {gpu_id} reported matrix size {timing.get('n')} instead of {n}.")
+                    raise ValueError(f"{hotkey}: Unexpected compute matrix size.")
             bt.logging.trace(f"{hotkey}: [Step 6] Compute mode executed on miner - Matrix Size: {n}")
-            start_time = time.time()
-            execution_output = execute_script_on_miner(ssh_client, mode='compute')
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            bt.logging.trace(f"{hotkey}: Compute mode execution time: {elapsed_time:.2f} seconds.")
-            # Parse the execution output
-            root_hashes_list, gpu_timings_list = parse_merkle_output(execution_output)
+            bt.logging.trace(f"{hotkey}: Benchmark and compute mode execution time: {elapsed_time:.2f} seconds.")
             bt.logging.trace(f"{hotkey}: [Merkle Proof] Root hashes received from GPUs:")
             for gpu_id, root_hash in root_hashes_list:
                 bt.logging.trace(f"{hotkey}: GPU {{gpu_id}}: {{root_hash}}")
@@ -912,25 +1002,24 @@ class Validator:
             bt.logging.trace(f"{hotkey}: Average Matrix Multiplication Time: {average_multiplication_time:.4f} seconds")
             bt.logging.trace(f"{hotkey}: Average Merkle Tree Time: {average_merkle_tree_time:.4f} seconds")
 
-            timing_passed = False
-            if elapsed_time < time_tol + num_gpus * time_fp32 and average_multiplication_time < time_fp32:
-                timing_passed = True
+            # Phase caps come from the matrix sizes the validator derives itself
+            expected_size_fp16 = adjust_matrix_size(vram, element_size=2, buffer_factor=1.0)
+            timing_passed = check_timing(
+                elapsed_time, time_fp16, gpu_timings_list, n, expected_size_fp16, gpu_name, gpu_data, merkle_proof,
+            )
 
             # Step 7: Verify merkle proof
             root_hashes = {gpu_id: root_hash for gpu_id, root_hash in root_hashes_list}
-            gpu_timings = {gpu_id: timing for gpu_id, timing in gpu_timings_list}
-            n = gpu_timings[0]['n']  # Assuming same n for all GPUs
-            indices = {}
-            num_indices = 1
-            for gpu_id in range(num_gpus):
-                indices[gpu_id] = [(np.random.randint(0, n), np.random.randint(0, n)) for _ in range(num_indices)]
-            send_challenge_indices(ssh_client, indices)
-            execution_output = execute_script_on_miner(ssh_client, mode='proof')
+            indices = get_random_indices(num_gpus, n, num_indices)
+            await session.request("proof", indices=indices, chunk_size=chunk_size, hash_algorithm=hash_algorithm)
             bt.logging.trace(f"{hotkey}: [Merkle Proof] Proof mode executed on miner.")
-            responses = receive_responses(ssh_client, num_gpus)
+            responses = await receive_responses(transport, num_gpus, max_size=response_size(num_indices, n, chunk_size))
             bt.logging.trace(f"{hotkey}: [Merkle Proof] Responses received from miner.")
 
-            verification_passed = verify_responses(seeds, root_hashes, responses, indices, n)
+            verification_passed = await asyncio.get_running_loop().run_in_executor(
+                self.verification_executor, verify_responses, seeds, root_hashes, responses, indices, n, chunk_size,
+                hash_algorithm,
+            )
             if verification_passed and timing_passed:
                 bt.logging.info(f"✅ {hotkey}: GPU Identification: Detected {num_gpus} x {gpu_name} GPU(s)")
                 return (hotkey, gpu_name, num_gpus)
@@ -938,21 +1027,62 @@ class Validator:
                 bt.logging.info(f"⚠️  {hotkey}: GPU Identification: Aborted due to verification failure")
                 return (hotkey, None, 0)
 
+        except asyncio.CancelledError:
+            # Timed out by proof_of_gpu while still allocating or connecting
+            if setup_start is not None:
+                self.record_pog_setup(setup_start, failed=True)
+            raise
+
         except Exception as e:
             bt.logging.info(f"❌ {hotkey}: Error testing Miner: {e}")
+            if setup_start is not None:
+                self.record_pog_setup(setup_start, failed=True)
             return (hotkey, None, 0)
 
         finally:
+            if session:
+                await session.close()
+            if transport:
+                await transport.close()
             if allocation_status and miner_info:
                 await self.deallocate_miner(axon, public_key)
 
+    def record_pog_setup(self, started, failed=False):
+        """
+        Report how long allocating and connecting to a miner took to the Proof-of-GPU limiter.
+
+        :param started: time.monotonic() before the allocation request.
+        :param failed: Whether allocation or the SSH connection raised.
+        """
+        if self.pog_limiter is not None:
+            self.pog_limiter.record(started, failed)
+
+    def get_dendrite(self):
+        """
+        Dendrite used to query miners during Proof-of-GPU.
+
+        :return: An async context manager yielding a callable dendrite.
+        """
+        return bt.dendrite(wallet=self.wallet)
+
+    def create_transport(self, miner_info):
+        """
+        Transport used to reach an allocated miner during Proof-of-GPU.
+
+        :param miner_info: Decrypted allocation info (host, port, username, password).
+        :return: An unconnected Transport.
+        """
+        return AsyncSSHTransport(miner_info['host'], port=miner_info.get('port', 22), username=miner_info['username'], password=miner_info['password'], connect_timeout=10)
+
     async def allocate_miner(self, axon, private_key, public_key):
         """
         Allocate a miner by querying the allocator.
 
         :param uid: Unique identifier for the axon.
         :param axon: Axon object containing miner details.
-        :return: Dictionary with miner details if successful, None otherwise.
+        :return: Dictionary with miner details if successful, None if the miner declined.
+        :raises TimeoutError: If the miner did not answer an allocation query.
+        :raises ConnectionError: If the miner could not be reached.
         """
         try:
 
@@ -963,14 +1093,17 @@ class Validator:
             docker_requirement = {
                 "base_image": "pytorch/pytorch:2.7.0-cuda12.6-cudnn9-runtime",
             }
-            async with bt.dendrite(wallet=self.wallet) as dendrite:
+            async with self.get_dendrite() as dendrite:
                 # Simulate an allocation query with Allocate
                 check_allocation = await dendrite(
                     axon,
                     Allocate(timeline=1, device_requirement=device_requirement, checking=True),
                     timeout=15,
                     )
-                if check_allocation and check_allocation ["status"] is True:
+                # A timed-out query comes back with an empty output
+                if not check_allocation:
+                    raise TimeoutError("No response to the allocation check.")
+                if check_allocation["status"] is True:
                     response = await dendrite(
                         axon,
                         Allocate(
@@ -982,7 +1115,9 @@ class Validator:
                         ),
                         timeout=60,
                     )
-                    if response and response.get("status") is True:
+                    if not response:
+                        raise TimeoutError("No response to the allocation request.")
+                    if response.get("status") is True:
                         bt.logging.trace(f"Successfully allocated miner {axon.hotkey}")
                         decrypted_info_str = rsa.decrypt_data(
                             private_key.encode("utf-8"),
@@ -998,15 +1133,19 @@ class Validator:
                         }
                         return miner_info
                     else:
-                        bt.logging.trace(f"{axon.hotkey}: Miner allocation failed or no response received.")
+                        bt.logging.trace(f"{axon.hotkey}: Miner allocation failed.")
                         return None
                 else:
-                    bt.logging.trace(f"{axon.hotkey}: Miner aready allocated or no response received.")
+                    bt.logging.trace(f"{axon.hotkey}: Miner aready allocated.")
                     return None
 
         except ConnectionRefusedError as e:
             bt.logging.error(f"{axon.hotkey}: Connection refused during miner allocation: {e}")
-            return None
+            raise
+        except (ConnectionError, asyncio.TimeoutError, TimeoutError) as e:
+            # Unanswered or dropped queries are overload signals for the Proof-of-GPU limiter
+            bt.logging.trace(f"{axon.hotkey}: Miner allocation timed out or was dropped: {e}")
+            raise
         except Exception as e:
             bt.logging.trace(f"{axon.hotkey}: Exception during miner allocation for: {e}")
             return None
@@ -1043,7 +1182,7 @@ class Validator:
 
             while allocation_status and retry_count < max_retries:
                 try:
-                    async with bt.dendrite(wallet=self.wallet) as dendrite:
+                    async with self.get_dendrite() as dendrite:
                         # Send deallocation query
                         deregister_response = await dendrite(
                             axon,
@@ -1268,7 +1407,9 @@ class Validator:
 
             # If the user interrupts the program, gracefully exit.
             except KeyboardInterrupt:
+                self.verification_executor.shutdown(wait=False, cancel_futures=True)
                 self.db.close()
+                ComputeDb.close_connections()
                 bt.logging.success("Keyboard interrupt detected. Exiting validator.")
                 exit()
 
@@ -0,0 +1,95 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from neurons.Validator.concurrency import AIMDLimiter, backoff_delay
+
+
+def test_aimd_limiter_increase_and_decrease():
+    """
+    Test the AIMD limit updates.
+
+    Verifies that:
+    - Fast successes grow the limit additively up to max_limit
+    - A failure shrinks it multiplicatively, but not below min_limit
+    - Failures of operations started before the last decrease do not shrink it again
+    - A latency above the target counts as a congestion signal
+    """
+    limiter = AIMDLimiter(4, min_limit=2, max_limit=6, latency_target=10.0, decrease_factor=0.5)
+
+    for _ in range(100):
+        limiter.record(time.monotonic())
+    assert limiter.limit == 6
+
+    burst_start = time.monotonic()
+    limiter.record(burst_start, failed=True)
+    assert limiter.limit == 3
+    limiter.record(burst_start, failed=True)
+    assert limiter.limit == 3
+
+    limiter.record(time.monotonic(), failed=True)
+    limiter.record(time.monotonic(), failed=True)
+    assert limiter.limit == 2
+
+    limiter = AIMDLimiter(4, latency_target=1.0, decrease_factor=0.5)
+    limiter.record(time.monotonic() - 5)
+    assert limiter.limit == 2
+
+
+def test_aimd_limiter_bounds_in_flight():
+    """
+    Test that acquire() never admits more than limit concurrent operations.
+
+    Verifies that:
+    - Peak concurrency equals the limit
+    - Cancelling a waiting acquire does not leak a slot
+    """
+    async def scenario():
+        limiter = AIMDLimiter(3, max_limit=3)
+        running, peak = 0, 0
+
+        async def operation():
+            nonlocal running, peak
+            await limiter.acquire()
+            try:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+            finally:
+                limiter.release()
+
+        await asyncio.gather(*(operation() for _ in range(20)))
+        assert peak == 3
+        assert limiter.in_flight == 0
+
+        for _ in range(3):
+            await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        for _ in range(3):
+            limiter.release()
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_backoff_delay_grows_with_jitter():
+    """
+    Test exponential backoff with equal jitter.
+
+    Verifies that:
+    - Each delay lies in [d / 2, d] with d doubling per attempt
+    - Delays are capped
+    """
+    rng = random.Random(0)
+    for attempt, expected in [(1, 10), (2, 20), (3, 40), (6, 300), (30, 300)]:
+        delays = [backoff_delay(attempt, 10, 300, rng) for _ in range(50)]
+        assert all(expected / 2 <= delay <= expected for delay in delays)
+        assert len(set(delays)) > 1
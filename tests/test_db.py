@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from compute.utils.db import ComputeDb
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "database.db"
+    monkeypatch.setenv("SQLITE_DB_PATH", str(path))
+    yield path
+    ComputeDb.close_connections()
+
+
+def test_connections_are_pooled_and_tuned(db_path):
+    """
+    Test the process-wide connection pool.
+
+    Verifies that:
+    - The database runs in WAL mode with the busy timeout applied
+    - Live ComputeDb handles get their own connections; a closed handle's is reused
+    - The schema is created once per process, not on every construction
+    """
+    db = ComputeDb()
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+    other = ComputeDb()
+    assert other.conn is not db.conn
+    conn = other.conn
+    other.close()
+    assert ComputeDb().conn is conn
+
+    db.conn.execute("DROP TABLE blacklist")
+    db.conn.commit()
+    ComputeDb()
+    assert db.conn.execute("SELECT name FROM sqlite_master WHERE name = 'blacklist'").fetchone() is None
+
+
+def test_interleaved_handles_keep_separate_transactions(db_path):
+    """
+    Test two handles used alternately on one thread, as by async register API handlers.
+
+    Verifies that:
+    - A handle does not see, or commit, another handle's uncommitted writes
+    - close() rolls back what the handle left uncommitted before pooling its connection
+    """
+    first, second = ComputeDb(), ComputeDb()
+    first.conn.execute("INSERT INTO blacklist (hotkey, details) VALUES ('first', '{}')")
+    assert second.conn.execute("SELECT COUNT(*) FROM blacklist").fetchone()[0] == 0
+    second.conn.commit()
+    first.close()
+    second.close()
+
+    assert ComputeDb().conn.execute("SELECT COUNT(*) FROM blacklist").fetchone()[0] == 0
+    assert not ComputeDb().conn.in_transaction
+
+
+def test_concurrent_writers_do_not_fail(db_path):
+    """
+    Test concurrent writes from several threads, as in the register API's thread pool.
+
+    Verifies that:
+    - Writers wait for each other instead of raising "database is locked"
+    - Every row is committed
+    """
+    ComputeDb()
+    errors = []
+
+    def writer(k):
+        try:
+            db = ComputeDb()
+            for i in range(50):
+                cursor = db.get_cursor()
+                cursor.execute("INSERT INTO blacklist (hotkey, details) VALUES (?, ?)", (f"{k}-{i}", "{}"))
+                db.conn.commit()
+                cursor.close()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            ComputeDb.close_connections()
+
+    threads = [threading.Thread(target=writer, args=(k,)) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert ComputeDb().conn.execute("SELECT COUNT(*) FROM blacklist").fetchone()[0] == 400
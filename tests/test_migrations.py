@@ -0,0 +1,50 @@
+import sqlite3
+
+from compute.utils.db import connect
+from compute.utils.migrations import MIGRATIONS, get_schema_version, migrate
+
+
+def test_migrate_new_database(tmp_path):
+    """
+    Test migrating an empty database.
+
+    Verifies that:
+    - Every migration is applied once and recorded in schema_version
+    - Running the migrations again is a no-op
+    """
+    conn = connect(str(tmp_path / "database.db"))
+
+    assert migrate(conn) == MIGRATIONS[-1][0]
+    versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert versions == [version for version, _, _ in MIGRATIONS]
+
+    assert migrate(conn) == MIGRATIONS[-1][0]
+    assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == len(MIGRATIONS)
+    conn.close()
+
+
+def test_migrate_legacy_miner_details(tmp_path):
+    """
+    Test upgrading a pre-1.3.11 database without a schema_version table.
+
+    Verifies that:
+    - miner_details is rebuilt with a UNIQUE hotkey and no_specs_count, keeping its data
+    - Duplicate hotkeys keep their newest row
+    """
+    path = str(tmp_path / "database.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE miner_details (id INTEGER PRIMARY KEY, hotkey TEXT, details TEXT)")
+    legacy.executemany("INSERT INTO miner_details (id, hotkey, details) VALUES (?, ?, ?)", [(1, "a", "{}"), (2, "b", '{"x": 1}'), (3, "a", '{"y": 2}')])
+    legacy.commit()
+    legacy.close()
+
+    conn = connect(path)
+    migrate(conn)
+
+    assert conn.execute("SELECT hotkey, details, no_specs_count FROM miner_details ORDER BY hotkey").fetchall() == [
+        ("a", '{"y": 2}', 0),
+        ("b", '{"x": 1}', 0),
+    ]
+    conn.execute("INSERT INTO miner_details (hotkey, details) VALUES ('c', '{}') ON CONFLICT(hotkey) DO NOTHING")
+    assert get_schema_version(conn) == MIGRATIONS[-1][0]
+    conn.close()
@@ -0,0 +1,46 @@
+import pytest
+
+from compute.utils.db import ComputeDb
+from neurons.Validator.database.allocate import get_miner_details, update_miner_details
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "database.db"))
+    db = ComputeDb()
+    yield db
+    ComputeDb.close_connections()
+
+
+def _no_specs_count(db, hotkey):
+    return db.conn.execute("SELECT no_specs_count FROM miner_details WHERE hotkey = ?", (hotkey,)).fetchone()[0]
+
+
+def test_update_miner_details_skips_unchanged_rows(db):
+    """
+    Test the bulk upsert of miner specs.
+
+    Verifies that:
+    - New specs are inserted and a second identical sync writes nothing
+    - Key order does not count as a change; a changed spec is written
+    - Missing specs store '{}' and count up to 5, after which nothing is written
+    - Specs coming back reset no_specs_count
+    """
+    specs = {"gpu": {"count": 1, "details": [{"name": "NVIDIA H100"}]}, "has_docker": True}
+    reordered = {"has_docker": True, "gpu": {"details": [{"name": "NVIDIA H100"}], "count": 1}}
+
+    assert update_miner_details(db, [("a", specs), ("b", specs)]) == 2
+    assert update_miner_details(db, [("a", reordered), ("b", specs)]) == 0
+    assert update_miner_details(db, [("a", {**specs, "has_docker": False}), ("b", specs)]) == 1
+    assert get_miner_details(db)["a"]["has_docker"] is False
+
+    for expected in range(1, 6):
+        assert update_miner_details(db, [("b", {})]) == 1
+        assert _no_specs_count(db, "b") == expected
+    assert get_miner_details(db)["b"] == {}
+    assert update_miner_details(db, [("b", {})]) == 0
+    assert _no_specs_count(db, "b") == 5
+
+    assert update_miner_details(db, [("b", specs)]) == 1
+    assert _no_specs_count(db, "b") == 0
+    assert get_miner_details(db)["b"] == specs
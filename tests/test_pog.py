@@ -0,0 +1,491 @@
+import asyncio
+import shlex
+import shutil
+import subprocess
+import sys
+import numpy as np
+import pytest
+import torch
+
+from compute.utils.executor import spawn_process_pool
+from neurons.Validator import miner_script_m_merkletree as miner_script
+from neurons.Validator.pog import (
+    MinerScriptSession,
+    check_timing,
+    compute_challenged_values,
+    generate_prng_block,
+    generate_prng_cols,
+    generate_prng_rows,
+    get_random_indices,
+    get_random_seeds,
+    load_yaml_config,
+    parse_responses,
+    proof_matrix_size,
+    receive_responses,
+    response_size,
+    verify_merkle_proof_chunk,
+    verify_responses,
+)
+from neurons.Validator.transport import Transport
+
+
+@pytest.mark.parametrize("seed", [0, 12345, 2**32 + 7, 2**64 - 1])
+def test_generate_prng_block_matches_miner(seed):
+    """
+    Test that the vectorised validator PRNG reproduces the miner's matrix.
+
+    Verifies that:
+    - Rows and columns generated with NumPy are bit-identical to generate_matrix_torch
+    - A sparse block of entries matches the same cells of the full matrix
+    """
+    n = 67
+    expected = miner_script.generate_matrix_torch(seed, n).numpy()
+
+    rows = [0, 5, n - 1]
+    cols = [3, 0, n - 2]
+    assert np.array_equal(generate_prng_rows(seed, rows, n), expected[rows, :])
+    assert np.array_equal(generate_prng_cols(seed, cols, n), expected[:, cols])
+    assert np.array_equal(generate_prng_block(seed, rows, cols), expected[np.ix_(rows, cols)])
+
+
+@pytest.mark.parametrize("block_elements", [1, 7 * 45, 1 << 22])
+def test_generate_matrix_torch_blocked_is_bit_identical(block_elements):
+    """
+    Test that row-block generation matches materialising every index at once.
+
+    Verifies that:
+    - Blocks of one row, uneven blocks and a single block give the same bits
+    - Seeds that overflow signed 64-bit arithmetic are handled identically
+    """
+    n = 45
+    s = 2**64 - 3
+    s_signed = (s + 2**63) % 2**64 - 2**63
+    i_indices = torch.arange(n, dtype=torch.int64).repeat_interleave(n)
+    j_indices = torch.arange(n, dtype=torch.int64).repeat(n)
+    states = (torch.tensor(s_signed, dtype=torch.int64) + i_indices % (2**32) + j_indices) & 0xFFFFFFFF
+    for _ in range(10):
+        states = miner_script.xorshift32_torch(states)
+    expected = (states.float() / float(0xFFFFFFFF)).reshape(n, n)
+
+    actual = miner_script.generate_matrix_torch(s, n, block_elements=block_elements).cpu()
+    assert torch.equal(actual, expected)
+
+
+def _miner_responses(seeds, indices, n, chunk_size=None, hash_algorithm="sha256"):
+    """Run the miner's compute and proof steps on CPU and return (root_hashes, responses)."""
+    hash_func = miner_script.get_hash_func(hash_algorithm)
+    chunk_size = chunk_size or n
+    num_chunks = (n + chunk_size - 1) // chunk_size
+    root_hashes, responses = {}, {}
+    for gpu_id, (s_A, s_B) in seeds.items():
+        C = (miner_script.generate_matrix_torch(s_A, n) @ miner_script.generate_matrix_torch(s_B, n)).numpy()
+        root_hash, tree = miner_script.build_merkle_tree_rows(C, hash_func, chunk_size=chunk_size)
+        root_hashes[gpu_id] = root_hash.hex()
+        rows, proofs = [], []
+        for i, j in indices[gpu_id]:
+            c = j // chunk_size
+            _, chunk_tree = miner_script.build_row_chunk_tree(C[i, :], chunk_size, hash_func)
+            rows.append(C[i, c * chunk_size:(c + 1) * chunk_size])
+            proofs.append(miner_script.get_merkle_proof_row(chunk_tree, c, num_chunks) + miner_script.get_merkle_proof_row(tree, i, n))
+        responses[gpu_id] = miner_script.pack_responses(indices[gpu_id], rows, proofs)
+    return root_hashes, responses
+
+
+@pytest.mark.parametrize("n", [1, 2, 13, 64])
+def test_array_merkle_tree_round_trips_through_npy(n, tmp_path):
+    """
+    Test the contiguous array Merkle tree saved as plain .npy and memory-mapped back.
+
+    Verifies that:
+    - The tree is a (num_nodes, 32) uint8 array that loads without pickle
+    - Proofs read from the memory-mapped tree verify every row, including odd level sizes
+    """
+    C = np.random.default_rng(n).random((n, 8), dtype=np.float32)
+    root_hash, tree = miner_script.build_merkle_tree_rows(C)
+    assert tree.shape == (miner_script.merkle_tree_size(n), 32) and tree.dtype == np.uint8
+
+    np.save(tmp_path / "tree.npy", tree)
+    mapped = np.load(tmp_path / "tree.npy", mmap_mode="r", allow_pickle=False)
+    for i in range(n):
+        proof = miner_script.get_merkle_proof_row(mapped, i, n)
+        assert verify_merkle_proof_chunk(C[i], proof, root_hash, i, 0, n, 1)
+
+
+@pytest.mark.parametrize("chunk_size", [4, 8, 12])
+@pytest.mark.parametrize("hash_algorithm", ["sha256", "blake3"])
+def test_chunk_leaves_match_per_row_chunk_trees(chunk_size, hash_algorithm):
+    """
+    Test the batched chunk-mode leaf hashing against one chunk tree per row.
+
+    Verifies that:
+    - Every row leaf equals the root of build_row_chunk_tree, including odd chunk counts
+    - Row blocks that do not divide the matrix give the same leaves
+    """
+    C = np.random.default_rng(chunk_size).random((24, 24), dtype=np.float32)
+    hash_func = miner_script.get_hash_func(hash_algorithm)
+    expected = b"".join(miner_script.build_row_chunk_tree(C[i, :], chunk_size, hash_func)[0] for i in range(len(C)))
+
+    leaves = np.empty((len(C), 32), dtype=np.uint8)
+    miner_script.hash_row_leaves(C, leaves, hash_func, chunk_size, block_rows=5)
+    assert leaves.tobytes() == expected
+
+
+@pytest.mark.parametrize("chunk_size", [None, 8])
+@pytest.mark.parametrize("block_rows", [1, 5, 64])
+def test_streamed_merkle_tree_matches_phased_build(chunk_size, block_rows):
+    """
+    Test the pipelined row-block transfer and hashing on CPU tensors.
+
+    Verifies that:
+    - Every row of C lands in the host output, including a short last block
+    - Root and tree are identical to build_merkle_tree_rows on the full matrix
+    """
+    C = miner_script.generate_matrix_torch(3, 24) @ miner_script.generate_matrix_torch(5, 24)
+    C_out = np.empty(tuple(C.shape), dtype=np.float32)
+
+    root_hash, tree, _ = miner_script.build_merkle_tree_streamed(C, C_out, chunk_size=chunk_size, block_rows=block_rows)
+
+    expected_root, expected_tree = miner_script.build_merkle_tree_rows(C.numpy(), chunk_size=chunk_size)
+    assert np.array_equal(C_out, C.numpy())
+    assert root_hash == expected_root
+    assert np.array_equal(tree, expected_tree)
+
+
+def test_verify_responses_multi_index():
+    """
+    Test batched verification of several challenged cells per GPU.
+
+    Verifies that:
+    - Honest responses for many indices pass verification
+    - A single tampered cell makes the GPU fail verification
+    """
+    n = 64
+    seeds = get_random_seeds(2)
+    indices = get_random_indices(2, n, 16)
+    root_hashes, responses = _miner_responses(seeds, indices, n)
+
+    assert verify_responses(seeds, root_hashes, responses, indices, n)
+
+    i, j = indices[1][7]
+    tampered = bytearray(responses[1])
+    parse_responses(tampered)['rows'][7, j] += 1.0
+    responses[1] = bytes(tampered)
+    assert not verify_responses(seeds, root_hashes, responses, indices, n)
+
+
+def test_compute_challenged_values_precision_at_production_size():
+    """
+    Test the validator's challenged cells at a production-sized n.
+
+    Verifies that:
+    - Values match a float64 reference far inside the np.isclose tolerance used by
+      verify_responses, so honest miners are not failed by validator rounding
+    """
+    n = 29280
+    seeds = get_random_seeds(1)[0]
+    gpu_indices = get_random_indices(1, n, 32)[0]
+
+    values = compute_challenged_values(*seeds, gpu_indices, n)
+
+    A_rows = generate_prng_rows(seeds[0], [i for i, _ in gpu_indices], n).astype(np.float64)
+    B_cols = generate_prng_cols(seeds[1], [j for _, j in gpu_indices], n).astype(np.float64)
+    expected = np.einsum('ij,ji->i', A_rows, B_cols)
+    assert np.max(np.abs(values - expected) / expected) < 1e-8
+
+
+def test_verify_responses_chunk_mode():
+    """
+    Test verification when the miner opens row chunks instead of whole rows.
+
+    Verifies that:
+    - Honest chunk openings with chunk-then-row proofs pass verification
+    - A tampered chunk value or a response in row layout fails verification
+    """
+    n, chunk_size = 64, 16
+    seeds = get_random_seeds(1)
+    indices = get_random_indices(1, n, 8)
+    root_hashes, responses = _miner_responses(seeds, indices, n, chunk_size)
+
+    assert verify_responses(seeds, root_hashes, responses, indices, n, chunk_size)
+
+    _, j = indices[0][3]
+    tampered = bytearray(responses[0])
+    parse_responses(tampered)['rows'][3, j % chunk_size] += 1.0
+    assert not verify_responses(seeds, root_hashes, {0: bytes(tampered)}, indices, n, chunk_size)
+
+    _, row_responses = _miner_responses(seeds, indices, n)
+    assert not verify_responses(seeds, root_hashes, row_responses, indices, n, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 16])
+def test_verify_responses_blake3(chunk_size):
+    """
+    Test Merkle proofs built and checked with the configurable BLAKE3 hash.
+
+    Verifies that:
+    - Miner trees built with multithreaded BLAKE3 verify with hash_algorithm='blake3'
+    - The same responses fail when checked as SHA-256
+    - Unknown algorithms are rejected
+    """
+    n = 64
+    seeds = get_random_seeds(1)
+    indices = get_random_indices(1, n, 8)
+    root_hashes, responses = _miner_responses(seeds, indices, n, chunk_size, "blake3")
+
+    assert verify_responses(seeds, root_hashes, responses, indices, n, chunk_size, "blake3")
+    assert not verify_responses(seeds, root_hashes, responses, indices, n, chunk_size, "sha256")
+    with pytest.raises(ValueError):
+        verify_responses(seeds, root_hashes, responses, indices, n, chunk_size, "md5")
+
+
+def test_parse_responses_rejects_malformed_payloads():
+    """
+    Test the binary proof response parser.
+
+    Verifies that:
+    - Rows, proofs and indices are exposed with the packed shapes and values
+    - Truncated payloads and unknown headers raise ValueError
+    - A hash size other than 32 bytes or a row length other than the expected one raises ValueError
+    """
+    n = 16
+    indices = [(3, 4), (15, 0)]
+    rows = [np.arange(n, dtype=np.float32), np.ones(n, dtype=np.float32)]
+    proofs = [[bytes([k]) * 32 for k in range(4)], [bytes([k + 4]) * 32 for k in range(4)]]
+    data = miner_script.pack_responses(indices, rows, proofs)
+
+    parsed = parse_responses(data)
+    assert parsed['indices'].tolist() == [[3, 4], [15, 0]]
+    assert np.array_equal(parsed['rows'], np.stack(rows))
+    assert parsed['proofs'].shape == (2, 4, 32)
+    assert parsed['proofs'][1, 2].tobytes() == proofs[1][2]
+
+    with pytest.raises(ValueError):
+        parse_responses(data[:-1])
+    with pytest.raises(ValueError):
+        parse_responses(b"XXXX" + data[4:])
+    assert parse_responses(data, row_length=n)['rows'].shape == (2, n)
+    with pytest.raises(ValueError):
+        parse_responses(data, row_length=n // 2)
+
+    # Same payload size, read as 8 proof hashes of 16 bytes per index
+    header = miner_script.RESPONSE_HEADER
+    relabelled = header.pack(miner_script.RESPONSE_MAGIC, miner_script.RESPONSE_VERSION, 16, 2, n, 8) + data[header.size:]
+    with pytest.raises(ValueError, match="hash size"):
+        parse_responses(relabelled)
+
+
+def test_verify_responses_in_process_pool(capfd):
+    """
+    Test that a verification job can be shipped to a spawned worker process.
+
+    Verifies that:
+    - verify_responses and its (seeds, root_hashes, responses, indices, n) job are picklable
+    - The verdict computed in the worker matches the in-process one
+    - The worker shuts down without a traceback from bittensor's logging thread
+    """
+    n = 32
+    seeds = get_random_seeds(1)
+    indices = get_random_indices(1, n, 4)
+    root_hashes, responses = _miner_responses(seeds, indices, n)
+
+    with spawn_process_pool(1) as pool:
+        verdict = pool.submit(verify_responses, seeds, root_hashes, responses, indices, n).result()
+    assert verdict is True
+    assert "Traceback" not in capfd.readouterr().err
+
+
+@pytest.mark.parametrize("vram", [8.59, 34.36, 68.72])
+@pytest.mark.parametrize("chunk_size", [None, 512])
+def test_proof_matrix_size_matches_miner(vram, chunk_size):
+    """
+    Test that the validator sizes the combined benchmark/compute matrices like the miner.
+
+    Verifies that:
+    - pog.proof_matrix_size and the miner script's copy agree
+    - In chunk mode n is a whole number of chunks
+    """
+    n, chunk = proof_matrix_size(vram, chunk_size)
+    assert (n, chunk) == miner_script.proof_matrix_size(vram, chunk_size)
+    if chunk_size:
+        assert n % chunk == 0
+
+
+def _gpu_timings(num_gpus, n, tflops_fp32, efficiency, generation_time, transfer_back_time, merkle_tree_time):
+    multiplication_time = 2 * n ** 3 / (tflops_fp32 * efficiency * 1e12)
+    return [
+        (gpu_id, {
+            "n": n, "generation_time": generation_time, "multiplication_time": multiplication_time,
+            "transfer_back_time": transfer_back_time, "merkle_tree_time": merkle_tree_time,
+        })
+        for gpu_id in range(num_gpus)
+    ]
+
+
+@pytest.mark.parametrize("gpu_name, num_gpus", [
+    ("NVIDIA H100 80GB HBM3", 8),
+    ("NVIDIA A100-SXM4-40GB", 4),
+    ("NVIDIA RTX 4090", 1),
+])
+def test_check_timing_honest_slow_and_padded_miners(gpu_name, num_gpus):
+    """
+    Test the benchmark_compute timing check with realistic miner timings.
+
+    Verifies that:
+    - An honest multi-GPU miner whose matmuls reach 75% of the configured TFLOPS and that
+      spends seconds generating, copying back and hashing C passes
+    - The same miner fails once the request takes longer than its reported phases allow
+    - A matmul slower than matmul_time_tolerance times the expected time fails, whatever
+      the wall-clock time
+    - Inflated generation, Merkle or fp16 times do not buy wall-clock slack beyond the
+      validator's own caps
+    """
+    config = load_yaml_config("config.yaml")
+    gpu_data = config["gpu_performance"]
+    merkle_proof = config["merkle_proof"]
+    time_tol = merkle_proof["time_tolerance"]
+    matmul_tol = merkle_proof["matmul_time_tolerance"]
+    vram = gpu_data["GPU_AVRAM"][gpu_name]
+    tflops_fp32 = gpu_data["GPU_TFLOPS_FP32"][gpu_name]
+    size_fp16 = miner_script.adjust_matrix_size(vram, element_size=2, buffer_factor=1.0)
+    time_fp16 = 2 * size_fp16 ** 3 / (gpu_data["GPU_TFLOPS_FP16"][gpu_name] * 0.75 * 1e12)
+    n, _ = proof_matrix_size(vram)
+
+    # A and B generated at 10G elements/s; C copied back at 5 GB/s and hashed at 1 GB/s,
+    # as all GPUs share the host
+    generation_time = 2 * n ** 2 / 1e10
+    c_bytes = 4 * n ** 2
+    gpu_timings = _gpu_timings(num_gpus, n, tflops_fp32, 0.75, generation_time, c_bytes / 5e9, c_bytes / 1e9)
+    phases = max(sum(t for k, t in timing.items() if k != "n") for _, timing in gpu_timings)
+    # VRAM probe, fp16 setup and round trip
+    elapsed_time = 2.0 + time_fp16 + phases
+
+    def check(elapsed_time, timings, time_fp16=time_fp16):
+        return check_timing(elapsed_time, time_fp16, timings, n, size_fp16, gpu_name, gpu_data, merkle_proof)
+
+    assert check(elapsed_time, gpu_timings)
+
+    # Work hidden from the reported phases, e.g. a stall or an outsourced compute
+    assert not check(elapsed_time + time_tol, gpu_timings)
+
+    slow_timings = _gpu_timings(num_gpus, n, tflops_fp32, 0.75 / (matmul_tol + 0.5), generation_time, c_bytes / 5e9, c_bytes / 1e9)
+    assert not check(elapsed_time, slow_timings)
+
+    # The same hidden minute, reported as generation, Merkle or fp16 time
+    padding = 60.0
+    for phase in ("generation_time", "merkle_tree_time"):
+        padded_timings = [(gpu_id, {**timing, phase: timing[phase] + padding}) for gpu_id, timing in gpu_timings]
+        assert not check(elapsed_time + padding, padded_timings)
+    assert not check(elapsed_time + padding, gpu_timings, time_fp16 + padding)
+
+
+class _LocalTransport(Transport):
+    """Transport stand-in that runs commands as local subprocesses on the local filesystem."""
+
+    def __init__(self):
+        self.processes = []
+
+    async def connect(self):
+        pass
+
+    async def run(self, command):
+        process = await asyncio.create_subprocess_shell(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = await process.communicate()
+        return stdout.decode().strip(), stderr.decode().strip()
+
+    async def open_process(self, command):
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.processes.append(process)
+        return process
+
+    async def put(self, local_path, remote_path):
+        shutil.copyfile(local_path, remote_path)
+
+    async def read_file(self, remote_path, max_size=None):
+        with open(remote_path, "rb") as f:
+            data = f.read() if max_size is None else f.read(max_size + 1)
+        if max_size is not None and len(data) > max_size:
+            raise ValueError(f"{remote_path} is larger than {max_size} bytes")
+        return data
+
+    async def close(self):
+        pass
+
+
+def test_miner_script_session_agent_mode():
+    """
+    Test the framed request/response protocol of the miner script agent mode.
+
+    Verifies that:
+    - Several requests are served by the same remote process
+    - Agent-side errors are surfaced as RuntimeError without killing the session
+    - Closing the session terminates the agent
+    """
+    async def scenario():
+        transport = _LocalTransport()
+        session = await MinerScriptSession.start(transport, python_path=sys.executable, script_path=miner_script.__file__)
+
+        assert await session.request("gpu_info") == miner_script.get_gpu_info()
+        with pytest.raises(RuntimeError, match="unknown"):
+            await session.request("unknown")
+        assert (await session.request("gpu_info"))["num_gpus"] == miner_script.get_gpu_info()["num_gpus"]
+
+        await session.close()
+        assert len(transport.processes) == 1
+        assert await asyncio.wait_for(transport.processes[0].wait(), timeout=30) == 0
+
+    asyncio.run(scenario())
+
+
+def test_transport_requires_every_method():
+    """
+    Test that Transport is an abstract interface.
+
+    Verifies that:
+    - A transport missing any method fails at construction, not in the middle of a round
+    """
+    class _PartialTransport(Transport):
+        async def connect(self):
+            pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        _PartialTransport()
+    assert Transport.__abstractmethods__ == {"connect", "run", "open_process", "put", "read_file", "close"}
+
+
+class _InMemoryTransport(_LocalTransport):
+    """Transport stand-in serving files from a dict of remote path -> bytes."""
+
+    def __init__(self, files):
+        super().__init__()
+        self.files = files
+
+    async def read_file(self, remote_path, max_size=None):
+        data = self.files[remote_path]
+        if max_size is not None and len(data) > max_size:
+            raise ValueError(f"{remote_path} is larger than {max_size} bytes")
+        return data
+
+
+def test_receive_responses_in_memory():
+    """
+    Test that response files are fetched concurrently into memory.
+
+    Verifies that:
+    - Each GPU's response bytes are returned without touching the local disk
+    - A missing file yields None for that GPU only
+    - A file larger than the expected response size is rejected
+    """
+    data = miner_script.pack_responses([(0, 1)], [np.arange(4, dtype=np.float32)], [[b'\x00' * 32, b'\x01' * 32]])
+    assert len(data) == response_size(1, 4)
+    transport = _InMemoryTransport({
+        '/dev/shm/responses_gpu_0.bin': data,
+        '/dev/shm/responses_gpu_2.bin': data + b'\x00' * (1 << 20),
+    })
+
+    responses = asyncio.run(receive_responses(transport, 3, max_size=response_size(1, 4)))
+
+    assert responses[0] == data
+    assert responses[1] is None
+    assert responses[2] is None
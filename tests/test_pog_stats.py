@@ -0,0 +1,111 @@
+import pytest
+
+from compute.utils.db import ComputeDb, connect
+from compute.utils.migrations import MIGRATIONS, migrate
+from neurons.Validator.calculate_pow_score import build_gpu_score_lookup, calc_score_pog, calc_scores_pog
+from neurons.Validator.database.pog import get_latest_pog_specs, get_pog_specs, purge_pog_stats, trim_pog_stats, update_pog_stats
+from neurons.Validator.pog import load_yaml_config
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "database.db"))
+    db = ComputeDb()
+    yield db
+    ComputeDb.close_connections()
+
+
+def test_calc_scores_pog_matches_per_miner_score():
+    """
+    Test the batched PoG scoring used by sync_scores.
+
+    Verifies that:
+    - Every configured GPU with 1 to 10 GPUs scores the same as calc_score_pog
+    - Unknown GPUs and missing GPU counts score 0
+    """
+    config_data = load_yaml_config("config.yaml")
+    gpu_specs_list = [
+        {"gpu_name": gpu_name, "num_gpus": num_gpus}
+        for gpu_name in config_data["gpu_performance"]["gpu_scores"]
+        for num_gpus in range(1, 11)
+    ]
+
+    scores = calc_scores_pog(gpu_specs_list, build_gpu_score_lookup(config_data))
+
+    expected = [calc_score_pog(specs, "hotkey", [], config_data) for specs in gpu_specs_list]
+    assert scores.tolist() == pytest.approx(expected, rel=1e-6)
+    unknown = calc_scores_pog([{"gpu_name": "Unknown GPU", "num_gpus": 8}, {"gpu_name": "NVIDIA H100", "num_gpus": None}], build_gpu_score_lookup(config_data))
+    assert unknown.tolist() == [0.0, 0.0]
+
+
+def test_get_latest_pog_specs_matches_per_hotkey_query(db):
+    """
+    Test the single-query lookup of the latest verified spec per hotkey.
+
+    Verifies that:
+    - Each hotkey gets the same spec as get_pog_specs, skipping failed tests
+    - Hotkeys with only failed tests are absent
+    - purge_pog_stats removes all entries of the given hotkeys only
+    """
+    update_pog_stats(db, "a", "NVIDIA H100", 1)
+    update_pog_stats(db, "a", "NVIDIA H200", 2)
+    update_pog_stats(db, "a", None, None)
+    update_pog_stats(db, "b", "NVIDIA RTX 4090", 4)
+    update_pog_stats(db, "c", None, None)
+
+    latest = get_latest_pog_specs(db)
+
+    assert latest == {hotkey: get_pog_specs(db, hotkey) for hotkey in ("a", "b")}
+    assert latest["a"] == {"gpu_name": "NVIDIA H200", "num_gpus": 2}
+
+    purge_pog_stats(db, ["a", "c"])
+    assert get_latest_pog_specs(db) == {"b": {"gpu_name": "NVIDIA RTX 4090", "num_gpus": 4}}
+
+
+def test_trim_pog_stats_keeps_latest_spec_consistent(db):
+    """
+    Test the bulk pog_stats retention job and the materialised pog_latest rows.
+
+    Verifies that:
+    - Inserts no longer trim; the job keeps the newest entries of every hotkey
+    - A hotkey whose verified entries are all trimmed loses its latest spec
+    - A hotkey with a retained verified entry keeps it
+    """
+    update_pog_stats(db, "a", "NVIDIA H100", 1)
+    for _ in range(4):
+        update_pog_stats(db, "a", None, None)
+    update_pog_stats(db, "b", "NVIDIA H200", 8)
+    update_pog_stats(db, "b", None, None)
+
+    cursor = db.get_cursor()
+    assert cursor.execute("SELECT COUNT(*) FROM pog_stats WHERE hotkey = 'a'").fetchone()[0] == 5
+    assert get_pog_specs(db, "a") == {"gpu_name": "NVIDIA H100", "num_gpus": 1}
+
+    assert trim_pog_stats(db, keep=4) == 1
+
+    assert cursor.execute("SELECT COUNT(*) FROM pog_stats WHERE hotkey = 'a'").fetchone()[0] == 4
+    assert get_pog_specs(db, "a") is None
+    assert get_latest_pog_specs(db) == {"b": {"gpu_name": "NVIDIA H200", "num_gpus": 8}}
+
+
+def test_pog_latest_backfill_and_indexes(tmp_path):
+    """
+    Test the pog_stats migration on a database recorded before it existed.
+
+    Verifies that:
+    - pog_latest is backfilled from the existing history
+    - Latest-spec reads are primary-key lookups and history reads use the (hotkey, created_at) index
+    """
+    conn = connect(str(tmp_path / "legacy.db"))
+    migrate(conn, MIGRATIONS[:2])
+    conn.executemany("INSERT INTO pog_stats (hotkey, gpu_name, num_gpus) VALUES (?, ?, ?)", [("a", "NVIDIA H100", 2), ("a", None, None)])
+    conn.commit()
+
+    migrate(conn)
+
+    assert conn.execute("SELECT gpu_name, num_gpus FROM pog_latest WHERE hotkey = 'a'").fetchone() == ("NVIDIA H100", 2)
+    plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN SELECT gpu_name, num_gpus FROM pog_latest WHERE hotkey = ?", ("a",)))
+    assert "sqlite_autoindex_pog_latest" in plan
+    plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN SELECT MIN(created_at) FROM pog_stats WHERE hotkey = ?", ("a",)))
+    assert "idx_pog_stats_hotkey_created_at" in plan
+    conn.close()
@@ -0,0 +1,78 @@
+import datetime
+from types import SimpleNamespace
+
+from compute.utils.db import ComputeDb
+from neurons.Validator.database.pog import get_pog_history, update_pog_stats
+from neurons.Validator.scheduler import schedule_pog_targets, stable_streak
+
+NOW = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+ROUND = 4320
+GPU_SCORES = {"NVIDIA H100": 2.8, "NVIDIA RTX 4090": 0.68}
+
+
+def _rows(*results):
+    """History rows, newest first, from (gpu_name, num_gpus, age in rounds) tuples."""
+    return [(gpu_name, num_gpus, NOW - datetime.timedelta(seconds=age * ROUND)) for gpu_name, num_gpus, age in results]
+
+
+def test_schedule_pog_targets_priority_and_stretch():
+    """
+    Test the Proof-of-GPU round ordering.
+
+    Verifies that:
+    - New hotkeys come first, then recently failed miners, then due verifications
+    - Among due miners, higher-value GPUs are tested first
+    - Miners with repeated identical results are deferred until their stretched interval expires
+    """
+    axons = [SimpleNamespace(hotkey=name) for name in ("stable", "cheap", "failed", "valuable", "new", "fresh")]
+    history = {
+        "stable": _rows(("NVIDIA H100", 1, 1), ("NVIDIA H100", 1, 2), ("NVIDIA H100", 1, 3)),
+        "cheap": _rows(("NVIDIA RTX 4090", 1, 1)),
+        "failed": _rows((None, None, 0.1), ("NVIDIA H100", 2, 1)),
+        "valuable": _rows(("NVIDIA H100", 8, 1)),
+        "fresh": _rows(("NVIDIA H100", 1, 0.2)),
+    }
+
+    targets = schedule_pog_targets(axons, history, GPU_SCORES, ROUND, now=NOW)
+    assert [axon.hotkey for axon in targets] == ["new", "failed", "valuable", "cheap"]
+
+    later = NOW + datetime.timedelta(seconds=3 * ROUND)
+    assert "stable" in [axon.hotkey for axon in schedule_pog_targets(axons, history, GPU_SCORES, ROUND, now=later)]
+
+
+def test_stable_streak():
+    """
+    Test the count of repeated identical verifications.
+
+    Verifies that:
+    - A failure or a different GPU ends the streak
+    - A failed latest test has no streak
+    """
+    assert stable_streak(_rows(("NVIDIA H100", 1, 0), ("NVIDIA H100", 1, 1), ("NVIDIA H100", 2, 2))) == 2
+    assert stable_streak(_rows(("NVIDIA H100", 1, 0), (None, None, 1), ("NVIDIA H100", 1, 2))) == 1
+    assert stable_streak(_rows((None, None, 0), ("NVIDIA H100", 1, 1))) == 0
+    assert stable_streak([]) == 0
+
+
+def test_get_pog_history(tmp_path, monkeypatch):
+    """
+    Test reading the pog_stats history used for scheduling.
+
+    Verifies that:
+    - Rows are grouped by hotkey, newest first, with UTC datetimes
+    - Failed tests are kept as None results
+    """
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "database.db"))
+    db = ComputeDb()
+    try:
+        update_pog_stats(db, "miner", "NVIDIA H100", 1)
+        update_pog_stats(db, "miner", None, None)
+        update_pog_stats(db, "other", "NVIDIA RTX 4090", 2)
+
+        history = get_pog_history(db)
+    finally:
+        ComputeDb.close_connections()
+
+    assert [row[:2] for row in history["miner"]] == [(None, None), ("NVIDIA H100", 1)]
+    assert history["other"][0][:2] == ("NVIDIA RTX 4090", 2)
+    assert history["other"][0][2].tzinfo == datetime.timezone.utc
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from neurons.Validator.concurrency import AIMDLimiter
+from neurons.Validator.pog import load_yaml_config
+from neurons.Validator.simulator import SimulatedMiner, SimulatedValidator, build_fleet, run_simulation, simulation_config
+
+
+def test_simulated_fleet_proof_of_gpu(tmp_path):
+    """
+    Test a full proof_of_gpu round against a small simulated miner fleet.
+
+    Verifies that:
+    - Honest miners, including a multi-GPU one, pass benchmark, Merkle proof and verification
+    - Fake compute, a smaller committed matrix, corrupted proofs, busy and crashing miners
+      are not verified
+    - The summary reports attempts, tail latency and outcomes per behaviour
+    """
+    config_data = simulation_config(load_yaml_config("config.yaml"), retry_limit=2, retry_interval=0.01)
+    behaviours = ["honest", "honest", "fake_compute", "small_n", "bad_proof", "busy", "crash"]
+    miners = [
+        SimulatedMiner(uid, "NVIDIA H100 80GB HBM3", 2 if uid == 1 else 1, behaviour, latency=0.001)
+        for uid, behaviour in enumerate(behaviours)
+    ]
+
+    summary = asyncio.run(run_simulation(miners, config_data, db_path=str(tmp_path / "database.db"), verification_workers=1))
+
+    assert summary["miners"] == len(miners)
+    assert summary["outcomes"]["honest"] == {"miners": 2, "verified": 2}
+    for behaviour in ("fake_compute", "small_n", "bad_proof", "busy", "crash"):
+        assert summary["outcomes"][behaviour]["verified"] == 0
+    assert summary["attempts"] >= len(miners) - 1
+    assert summary["latency_p50"] <= summary["latency_p99"] <= summary["latency_max"]
+
+
+def test_build_fleet_mix():
+    """
+    Test the fleet builder.
+
+    Verifies that:
+    - The same seed yields the same behaviours
+    - dishonest=0 and busy=0 produce an all-honest fleet
+    """
+    first = [miner.behaviour for miner in build_fleet(50, dishonest=0.3, busy=0.1, seed=4)]
+    second = [miner.behaviour for miner in build_fleet(50, dishonest=0.3, busy=0.1, seed=4)]
+    assert first == second
+    assert {"honest", "busy"} <= set(first)
+    assert all(miner.behaviour == "honest" for miner in build_fleet(10))
+
+
+def test_simulated_round_stops_at_deadline(tmp_path):
+    """
+    Test that a Proof-of-GPU round is bounded by pog_deadline.
+
+    Verifies that:
+    - Miners that keep failing with a large retry budget do not hold the round past the deadline
+    """
+    config_data = simulation_config(load_yaml_config("config.yaml"), retry_limit=1000, retry_interval=0.05, deadline=1.0)
+    miners = [SimulatedMiner(uid, "NVIDIA H100 80GB HBM3", behaviour="crash", latency=0.001) for uid in range(3)]
+
+    summary = asyncio.run(run_simulation(miners, config_data, db_path=str(tmp_path / "database.db"), verification_workers=1))
+
+    assert summary["wall_time"] < 5
+    assert summary["max_attempts_per_miner"] > 1
+    assert summary["outcomes"]["crash"]["verified"] == 0
+
+
+def test_allocation_failures_and_timeouts_reduce_concurrency():
+    """
+    Test that setup failures reach the Proof-of-GPU concurrency limiter.
+
+    Verifies that:
+    - A dropped allocation query is recorded as a failure, not as a busy miner
+    - A test cancelled by the round's timeout while still allocating shrinks the limit too
+    """
+    config_data = simulation_config(load_yaml_config("config.yaml"))
+    dropping = SimulatedMiner(0, "NVIDIA H100 80GB HBM3", failure_rate=1.0)
+    hanging = SimulatedMiner(1, "NVIDIA H100 80GB HBM3", latency=10)
+
+    async def scenario():
+        validator = SimulatedValidator([dropping, hanging], config_data, db=None, verification_workers=1)
+        try:
+            validator.pog_limiter = AIMDLimiter(16, max_limit=64)
+            assert await validator.test_miner_gpu(dropping, config_data) == (dropping.hotkey, None, 0)
+            after_drop = validator.pog_limiter.limit
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(validator.test_miner_gpu(hanging, config_data), timeout=0.5)
+            return after_drop, validator.pog_limiter.limit
+        finally:
+            validator.close()
+
+    after_drop, after_timeout = asyncio.run(scenario())
+    assert after_drop < 16
+    assert after_timeout < after_drop